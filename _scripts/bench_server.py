@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Development Server Benchmark
+============================
+Starts _scripts/serve.py once per concurrency mode and drives it with
+concurrent clients (the closed-loop load of load_gen.py), reporting
+throughput and latency percentiles.
+
+Usage:
+    python3 _scripts/bench_server.py [--modes single threaded pool asyncio]
+                                     [--clients 16] [--duration 5] [--slow-clients 2]
+                                     [--keep-alive both]
+
+Options:
+    --modes          Concurrency modes to compare (default: all)
+    --clients        Concurrent client connections issuing requests (default: 16)
+    --duration       Seconds of load per mode (default: 5)
+    --slow-clients   Connections that send their request head very slowly,
+                     like a stalled browser tab (default: 0)
+    --keep-alive     off: every HTTP/1.1 request sends Connection: close, so each
+                     one opens a new connection (the default server behaviour);
+                     on: persistent connections (serve.py --keep-alive);
+                     both: run every mode both ways (default: off)
+    --json           Print the results as JSON instead of a table
+"""
+
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+
+from serve import MODES
+from load_gen import run_load, start_server, stop_server
+
+DEFAULT_PATHS = [
+    '/',
+    '/assets/data/site.config.json',
+    '/js/app.js',
+    '/css/style.css',
+]
+
+
+def slow_client(port, stop):
+    """Hold a connection open by trickling the request head a byte at a time."""
+    request = b'GET / HTTP/1.1\r\nHost: localhost\r\nX-Slow: ' + b'x' * 4096 + b'\r\n\r\n'
+    while not stop.is_set():
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=30) as sock:
+                for byte in request:
+                    if stop.is_set():
+                        return
+                    sock.send(bytes([byte]))
+                    time.sleep(0.01)
+                sock.recv(65536)
+        except OSError:
+            time.sleep(0.1)
+
+
+def benchmark_mode(mode, args, keep_alive=False):
+    """Run one load phase against a fresh server in the given mode."""
+    serve_args = ['--mode', mode, '--workers', str(args.workers)] + (['--keep-alive'] if keep_alive else [])
+    server, port = start_server(serve_args)
+    connection = 'keep-alive' if keep_alive else 'close'
+    try:
+        if port is None:
+            return {'mode': mode, 'connection': connection, 'error': 'server did not start'}
+
+        stop = threading.Event()
+        threads = [threading.Thread(target=slow_client, args=(port, stop), daemon=True)
+                   for _ in range(args.slow_clients)]
+        for thread in threads:
+            thread.start()
+        try:
+            results = run_load('127.0.0.1', port, args.paths, 'closed', args.clients,
+                               duration=args.duration, warmup=0, keep_alive=keep_alive)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join(timeout=15)
+    finally:
+        stop_server(server)
+
+    return {
+        'mode': mode,
+        'connection': connection,
+        'requests': results['requests'] - results['errors'],
+        'errors': results['errors'],
+        'rps': results['rps'],
+        'p50_ms': results['p50_ms'],
+        'p95_ms': results['p95_ms'],
+        'p99_ms': results['p99_ms'],
+    }
+
+
+def print_table(results):
+    print(f"{'mode':<10} {'connection':<11} {'requests':>9} {'errors':>7} {'req/s':>9} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['mode']:<10} {r['connection']:<11} ❌ {r['error']}")
+            continue
+        print(f"{r['mode']:<10} {r['connection']:<11} {r['requests']:>9} {r['errors']:>7} "
+              f"{r['rps']:>9} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark serve.py concurrency modes')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES), help='Modes to compare')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent client connections (default: 16)')
+    parser.add_argument('--duration', type=float, default=5, help='Seconds of load per mode (default: 5)')
+    parser.add_argument('--slow-clients', type=int, default=0, help='Slow connections held open (default: 0)')
+    parser.add_argument('--workers', type=int, default=16, help='Server threads for pool/asyncio (default: 16)')
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help='URL paths to request')
+    parser.add_argument('--keep-alive', choices=('off', 'on', 'both'), default='off',
+                        help='Connection reuse to benchmark (default: off)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    keep_alive_runs = {'off': [False], 'on': [True], 'both': [False, True]}[args.keep_alive]
+    results = []
+    for mode in args.modes:
+        for keep_alive in keep_alive_runs:
+            if not args.json:
+                label = ' with keep-alive' if keep_alive else ''
+                print(f"⏱️  Benchmarking {mode} mode{label} for {args.duration}s...")
+            results.append(benchmark_mode(mode, args, keep_alive))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print()
+        print_table(results)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
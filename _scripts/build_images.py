@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Responsive image derivatives for assets/images.
+Every JPEG/PNG is resized into width buckets and re-encoded as AVIF and WebP
+(where a local encoder supports them) plus its own format. Derivatives go to
+assets/images/derived/ named <stem>-<width>w.<key>.<ext>. The key is a hash
+of the source bytes, the encoder and its settings, so an existing file is
+never re-encoded. Those names are content-addressed and safe to cache as
+immutable. Jobs are spread across a process pool.
+
+assets/images/derived/manifest.json lists the variants of each image by MIME
+type; _scripts/prerender.py turns it into <picture>/srcset markup.
+
+Encoders, in order of preference: Pillow (pip install Pillow), libvips
+(vips), ImageMagick (magick/convert), cwebp for WebP. With none installed
+the manifest has no variants and pages keep the original images.
+
+Usage:
+    python3 _scripts/build_images.py [--jobs N]
+
+Options:
+    --jobs    Worker processes (default: CPU count)
+"""
+
+import os
+import sys
+import json
+import shutil
+import struct
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+IMAGE_DIR = os.path.join('assets', 'images')
+OUTPUT_DIR = os.path.join(IMAGE_DIR, 'derived')
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, 'manifest.json')
+SOURCE_EXTENSIONS = {'.jpg': 'jpeg', '.jpeg': 'jpeg', '.png': 'png'}
+WIDTHS = (240, 480, 960, 1600)
+KEY_LENGTH = 10
+# format -> (MIME type, extension, quality)
+FORMATS = {
+    'avif': ('image/avif', 'avif', 50),
+    'webp': ('image/webp', 'webp', 78),
+    'jpeg': ('image/jpeg', 'jpg', 80),
+    'png': ('image/png', 'png', None),
+}
+
+
+def image_size(path):
+    """Read (width, height) from a PNG or JPEG header without decoding the image."""
+    with open(path, 'rb') as f:
+        head = f.read(26)
+        if head.startswith(b'\x89PNG\r\n\x1a\n'):
+            return struct.unpack('>II', head[16:24])
+        if not head.startswith(b'\xff\xd8'):
+            raise ValueError(f'{path}: not a PNG or JPEG')
+        f.seek(2)
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                raise ValueError(f'{path}: no JPEG frame header')
+            if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+                continue
+            length = struct.unpack('>H', f.read(2))[0]
+            # SOF0-SOF15 carry the dimensions, except DHT (C4), JPG (C8) and DAC (CC)
+            if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack('>xHH', f.read(5))
+                return width, height
+            f.seek(length - 2, os.SEEK_CUR)
+
+
+def _pillow_supports(fmt):
+    if fmt in ('jpeg', 'png'):
+        return True
+    try:
+        return bool(features.check(fmt))
+    except ValueError:
+        return False
+
+
+def _magick_command():
+    for name in ('magick', 'convert'):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def _magick_supports(magick, fmt):
+    result = subprocess.run([magick, '-list', 'format'], capture_output=True, text=True)
+    return any(line.split()[:1] == [fmt.upper()] or line.split()[:1] == [fmt.upper() + '*']
+               for line in result.stdout.splitlines())
+
+
+def find_encoders():
+    """Map each output format to the name of the encoder that will produce it."""
+    candidates = []
+    if Image is not None:
+        candidates.append(('pillow', _pillow_supports))
+    if shutil.which('vips'):
+        candidates.append(('vips', lambda fmt: True))
+    magick = _magick_command()
+    if magick:
+        candidates.append(('magick', lambda fmt: _magick_supports(magick, fmt)))
+    if shutil.which('cwebp'):
+        candidates.append(('cwebp', lambda fmt: fmt == 'webp'))
+
+    encoders = {}
+    for fmt in FORMATS:
+        for name, supports in candidates:
+            if supports(fmt):
+                encoders[fmt] = name
+                break
+    return encoders
+
+
+def encode(encoder, source, target, width, fmt):
+    """Resize source to width and write it to target in fmt."""
+    quality = FORMATS[fmt][2]
+    if encoder == 'pillow':
+        with Image.open(source) as image:
+            height = round(image.height * width / image.width)
+            resized = image.resize((width, height), Image.LANCZOS)
+            if fmt == 'jpeg' and resized.mode not in ('RGB', 'L'):
+                resized = resized.convert('RGB')
+            options = {'optimize': True} if fmt in ('jpeg', 'png') else {}
+            if quality is not None:
+                options['quality'] = quality
+            resized.save(target, fmt.upper(), **options)
+        return
+    if encoder == 'vips':
+        options = f'[Q={quality},strip]' if quality is not None else '[strip]'
+        cmd = ['vips', 'thumbnail', source, target + options, str(width)]
+    elif encoder == 'magick':
+        cmd = [_magick_command(), source, '-resize', f'{width}x', '-strip']
+        if quality is not None:
+            cmd += ['-quality', str(quality)]
+        cmd.append(target)
+    elif encoder == 'cwebp':
+        cmd = ['cwebp', '-quiet', '-q', str(quality), '-resize', str(width), '0', source, '-o', target]
+    else:
+        raise ValueError(f'unknown encoder {encoder}')
+    subprocess.run(cmd, check=True, capture_output=True)
+
+
+def _run_job(job):
+    encoder, source, target, width, fmt = job
+    tmp_path = f'{target}.tmp.{FORMATS[fmt][1]}'
+    try:
+        encode(encoder, source, tmp_path, width, fmt)
+        os.replace(tmp_path, target)
+        return target, None
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return target, str(e)
+
+
+def derivative_key(source_digest, encoder, fmt):
+    settings = f'{encoder}:{fmt}:{FORMATS[fmt][2]}'
+    return hashlib.sha256(f'{source_digest}:{settings}'.encode('utf-8')).hexdigest()[:KEY_LENGTH]
+
+
+def plan_derivatives(project_root, encoders):
+    """Return (manifest, jobs): the manifest to write and the encodes still missing."""
+    image_dir = os.path.join(project_root, IMAGE_DIR)
+    images, jobs = {}, []
+    for filename in sorted(os.listdir(image_dir)):
+        stem, ext = os.path.splitext(filename)
+        source_format = SOURCE_EXTENSIONS.get(ext.lower())
+        if source_format is None:
+            continue
+        source = os.path.join(image_dir, filename)
+        with open(source, 'rb') as f:
+            source_digest = hashlib.sha256(f.read()).hexdigest()
+        width, height = image_size(source)
+        widths = sorted({w for w in WIDTHS if w < width} | {min(width, WIDTHS[-1])})
+
+        variants = {}
+        for fmt in ('avif', 'webp', source_format):
+            if fmt not in encoders:
+                continue
+            mime, extension, _ = FORMATS[fmt]
+            key = derivative_key(source_digest, encoders[fmt], fmt)
+            for w in widths:
+                relpath = os.path.join(OUTPUT_DIR, f'{stem}-{w}w.{key}.{extension}')
+                target = os.path.join(project_root, relpath)
+                if not os.path.exists(target):
+                    jobs.append((encoders[fmt], source, target, w, fmt))
+                variants.setdefault(mime, []).append({'path': relpath.replace(os.sep, '/'), 'width': w})
+        images[filename] = {'width': width, 'height': height, 'variants': variants}
+    return {'encoders': encoders, 'images': images}, jobs
+
+
+def build_images(project_root, jobs=None):
+    """Encode missing derivatives, drop unused ones and write the manifest; returns (encoded, failed)."""
+    os.makedirs(os.path.join(project_root, OUTPUT_DIR), exist_ok=True)
+    manifest, pending = plan_derivatives(project_root, find_encoders())
+
+    failed = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for target, error in pool.map(_run_job, pending):
+                if error:
+                    failed.append((target, error))
+                else:
+                    print(f"🖼️  {os.path.relpath(target, project_root)}")
+
+    failed_paths = {os.path.relpath(target, project_root).replace(os.sep, '/') for target, _ in failed}
+    keep = set()
+    for entry in manifest['images'].values():
+        for mime, variants in list(entry['variants'].items()):
+            variants[:] = [v for v in variants if v['path'] not in failed_paths]
+            if not variants:
+                del entry['variants'][mime]
+            keep.update(os.path.basename(v['path']) for v in variants)
+
+    output_dir = os.path.join(project_root, OUTPUT_DIR)
+    for filename in os.listdir(output_dir):
+        if filename != os.path.basename(MANIFEST_PATH) and filename not in keep:
+            os.remove(os.path.join(output_dir, filename))
+
+    manifest_path = os.path.join(project_root, MANIFEST_PATH)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return len(pending) - len(failed), failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate responsive image derivatives and their manifest')
+    parser.add_argument('--jobs', type=int, help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+
+    encoders = find_encoders()
+    if not encoders:
+        print("ℹ️  No image encoder found (pip install Pillow, or install libvips, ImageMagick or cwebp); "
+              "keeping original images")
+    else:
+        print(f"ℹ️  Encoders: {', '.join(f'{fmt}={name}' for fmt, name in encoders.items())}")
+
+    encoded, failed = build_images(project_root, args.jobs)
+    for target, error in failed:
+        print(f"❌ {os.path.relpath(target, project_root)}: {error}")
+    print(f"✅ Encoded {encoded} derivative(s); manifest at {MANIFEST_PATH}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
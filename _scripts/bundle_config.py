@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Split site.config.json into fingerprinted bundles for the browser.
+Writes two minified files next to the config:
+
+    site.config.critical.<hash>.json   name, role, summary, links, keywords, meta
+    site.config.rest.<hash>.json       projects, experience, keywordLinks, ...
+
+The critical bundle is what the hero needs for the first render and names
+the rest bundle, which js/app.js fetches afterwards. Filenames carry a
+content hash, so both can be cached as immutable; index.html's preload and
+the service worker's asset list are rewritten to the current names and
+bundles from earlier builds are removed.
+
+Usage:
+    python3 _scripts/bundle_config.py [--check]
+
+Options:
+    --check    Exit 1 if the bundles, index.html or sw.js are out of date, without writing
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+
+from site_config import CONFIG_PATH, ConfigError, load_site_config
+
+CRITICAL_KEYS = ('name', 'role', 'summary', 'links', 'keywords', 'meta')
+HASH_LENGTH = 10
+BUNDLE_PATTERN = re.compile(r'site\.config\.(critical|rest)\.[0-9a-f]{%d}\.json$' % HASH_LENGTH)
+PRELOAD_PATTERN = re.compile(r'<link rel="preload" href="\./assets/data/site\.config[^"]*\.json" as="fetch"[^>]*>')
+SW_BUNDLES_PATTERN = re.compile(r'"\.\./assets/data/site\.config[^"]*\.json"(,"\.\./assets/data/site\.config[^"]*\.json")*')
+SW_CACHE_PATTERN = re.compile(r'const CACHE = "andrewnixdorf-website[^"]*";')
+
+
+def minify(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def fingerprint(kind, body):
+    return f'site.config.{kind}.{hashlib.sha256(body).hexdigest()[:HASH_LENGTH]}.json'
+
+
+def split_config(config):
+    """Return (critical_name, critical_body, rest_name, rest_body).
+
+    Keys outside CRITICAL_KEYS go to the rest bundle, so new sections are
+    lazy by default. The critical bundle embeds the rest bundle's name, so
+    its own hash changes whenever either half does.
+    """
+    rest_body = minify({key: value for key, value in config.items() if key not in CRITICAL_KEYS})
+    rest_name = fingerprint('rest', rest_body)
+    critical = {key: config[key] for key in CRITICAL_KEYS if key in config}
+    critical['restBundle'] = rest_name
+    critical_body = minify(critical)
+    return fingerprint('critical', critical_body), critical_body, rest_name, rest_body
+
+
+def build_bundles(project_root, check=False):
+    """Bring the bundles, index.html and sw.js up to date; returns the list of stale paths."""
+    data_dir = os.path.join(project_root, os.path.dirname(CONFIG_PATH))
+    config = load_site_config(project_root)
+    critical_name, critical_body, rest_name, rest_body = split_config(config)
+    stale = []
+
+    for name, body in ((critical_name, critical_body), (rest_name, rest_body)):
+        path = os.path.join(data_dir, name)
+        if not os.path.exists(path):
+            stale.append(path)
+            if not check:
+                with open(path, 'wb') as f:
+                    f.write(body)
+
+    for filename in os.listdir(data_dir):
+        if BUNDLE_PATTERN.match(filename) and filename not in (critical_name, rest_name):
+            stale.append(os.path.join(data_dir, filename))
+            if not check:
+                os.remove(os.path.join(data_dir, filename))
+
+    cache_version = critical_name.split('.')[3]
+    rewrites = (
+        ('index.html', PRELOAD_PATTERN,
+         f'<link rel="preload" href="./assets/data/{critical_name}" as="fetch" crossorigin data-bundle="critical">'),
+        (os.path.join('js', 'sw.js'), SW_BUNDLES_PATTERN,
+         f'"../assets/data/{critical_name}","../assets/data/{rest_name}"'),
+        (os.path.join('js', 'sw.js'), SW_CACHE_PATTERN,
+         f'const CACHE = "andrewnixdorf-website-{cache_version}";'),
+    )
+    for relpath, pattern, replacement in rewrites:
+        path = os.path.join(project_root, relpath)
+        with open(path, 'r') as f:
+            text = f.read()
+        updated, count = pattern.subn(replacement, text, count=1)
+        if count == 0:
+            raise ValueError(f'{relpath}: no match for {pattern.pattern}')
+        if updated != text:
+            stale.append(path)
+            if not check:
+                with open(path, 'w') as f:
+                    f.write(updated)
+
+    return sorted(set(stale))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write fingerprinted critical/rest bundles of site.config.json')
+    parser.add_argument('--check', action='store_true', help='Only report whether anything is out of date')
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+
+    try:
+        stale = build_bundles(project_root, check=args.check)
+    except ConfigError as e:
+        print(f"❌ {CONFIG_PATH} is invalid:")
+        for error in e.errors:
+            print(f"  • {error}")
+        return 1
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.check:
+        if stale:
+            print("❌ Config bundles are out of date; run python3 _scripts/bundle_config.py")
+            for path in stale:
+                print(f"  • {os.path.relpath(path, project_root)}")
+            return 1
+        print("✅ Config bundles are up to date")
+        return 0
+
+    for path in stale:
+        print(f"📦 {os.path.relpath(path, project_root)}")
+    print(f"✅ Config bundles {'updated' if stale else 'already up to date'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Link Checker
+============
+Checks every link the site actually publishes: the href/src URLs in
+index.html, the <loc> entries in sitemap.xml and every URL in
+assets/data/site.config.json. Settings come from test/lychee.toml
+(max_concurrency, timeout, max_retries, max_redirects, accept, exclude,
+user_agent, output), so the config is shared with lychee.
+
+Connections are pooled per host and reused with HTTP/1.1 keep-alive. Results
+are kept in .linkcheck-cache.json; a URL that passed within --cache-ttl
+seconds is not requested again.
+
+Usage:
+    python3 _scripts/check_links.py [--config test/lychee.toml] [--cache-ttl 86400]
+                                    [--no-cache] [URL ...]
+
+Options:
+    --config       lychee-style TOML settings (default: test/lychee.toml)
+    --cache-ttl    Seconds a passing result stays valid (default: 86400)
+    --no-cache     Neither read nor write the result cache
+    --cache-file   Where results are cached (default: .linkcheck-cache.json)
+    URL            Check these URLs instead of the ones found in the site
+"""
+
+import os
+import re
+import sys
+import ssl
+import json
+import time
+import asyncio
+import tomllib
+import argparse
+import xml.etree.ElementTree as ET
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit, unquote
+
+DEFAULTS = {
+    'max_concurrency': 8,
+    'timeout': 20,
+    'max_retries': 2,
+    'max_redirects': 5,
+    'accept': [200],
+    'exclude': [],
+    'user_agent': 'andrewnixdorf-linkcheck',
+    'output': None,
+}
+PER_HOST_CONNECTIONS = 4
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+URL_PATTERN = re.compile(r'^https?://', re.IGNORECASE)
+
+
+def load_settings(config_path):
+    """Read lychee-style settings, falling back to DEFAULTS for missing keys."""
+    settings = dict(DEFAULTS)
+    if config_path and os.path.exists(config_path):
+        with open(config_path, 'rb') as f:
+            settings.update(tomllib.load(f))
+    return settings
+
+
+class LinkCollector(HTMLParser):
+    """Collects href/src attribute values from an HTML document.
+
+    Resource hints (preconnect, dns-prefetch) name origins, not pages, so
+    they are skipped.
+    """
+
+    HINT_RELS = {'preconnect', 'dns-prefetch'}
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'link' and self.HINT_RELS & set((attrs.get('rel') or '').lower().split()):
+            return
+        for name in ('href', 'src'):
+            if attrs.get(name):
+                self.links.append(attrs[name].strip())
+
+
+def collect_links(project_root):
+    """Map each link found in the site to the files that reference it.
+
+    External links are absolute http(s) URLs; local links are file paths
+    relative to the project root.
+    """
+    links = {}
+
+    def add(link, source):
+        links.setdefault(link, set()).add(source)
+
+    index_path = os.path.join(project_root, 'index.html')
+    if os.path.exists(index_path):
+        parser = LinkCollector()
+        with open(index_path, 'r', encoding='utf-8') as f:
+            parser.feed(f.read())
+        for link in parser.links:
+            if URL_PATTERN.match(link):
+                add(link, 'index.html')
+            elif not link.startswith(('#', 'mailto:', 'tel:', 'javascript:', 'data:')):
+                path = unquote(urlsplit(urljoin('/', link)).path).lstrip('/')
+                add(path or 'index.html', 'index.html')
+
+    sitemap_path = os.path.join(project_root, 'sitemap.xml')
+    if os.path.exists(sitemap_path):
+        for loc in ET.parse(sitemap_path).getroot().iter('{http://www.sitemaps.org/schemas/sitemap/0.9}loc'):
+            if loc.text:
+                add(loc.text.strip(), 'sitemap.xml')
+
+    config_path = os.path.join(project_root, 'assets', 'data', 'site.config.json')
+    if os.path.exists(config_path):
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+        stack = [config]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, list):
+                stack.extend(value)
+            elif isinstance(value, str) and URL_PATTERN.match(value):
+                add(value, 'site.config.json')
+
+    return links
+
+
+def is_excluded(url, patterns):
+    """lychee's exclude entries are regular expressions searched for in the URL."""
+    return any(re.search(pattern, url) for pattern in patterns)
+
+
+class LinkCache:
+    """On-disk cache of link results; only passing results are reused."""
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self.entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def get(self, url):
+        entry = self.entries.get(url)
+        if entry and entry['ok'] and time.time() - entry['checked'] < self.ttl:
+            return entry
+        return None
+
+    def put(self, url, result):
+        self.entries[url] = {'ok': result['ok'], 'status': result['status'], 'checked': time.time()}
+
+    def save(self):
+        if not self.path:
+            return
+        now = time.time()
+        fresh = {url: e for url, e in self.entries.items() if now - e['checked'] < self.ttl}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(fresh, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class HostPool:
+    """Idle keep-alive connections to one scheme://host:port, at most `limit` open."""
+
+    def __init__(self, scheme, host, port, limit):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.idle = []
+        self.slots = asyncio.Semaphore(limit)
+
+    async def acquire(self, timeout):
+        await self.slots.acquire()
+        while self.idle:
+            reader, writer = self.idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        try:
+            ssl_context = ssl.create_default_context() if self.scheme == 'https' else None
+            return await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=ssl_context), timeout
+            )
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, conn, reusable):
+        if reusable:
+            self.idle.append(conn)
+        else:
+            conn[1].close()
+        self.slots.release()
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+class LinkChecker:
+    """Checks URLs concurrently with per-host connection pools."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.accept = set(settings['accept'])
+        self.timeout = settings['timeout']
+        self.pools = {}
+        self.limit = asyncio.Semaphore(settings['max_concurrency'])
+
+    def pool_for(self, url):
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        if key not in self.pools:
+            self.pools[key] = HostPool(parts.scheme, parts.hostname, port, PER_HOST_CONNECTIONS)
+        return self.pools[key]
+
+    async def request(self, method, url):
+        """Send one request; returns (status, headers)."""
+        parts = urlsplit(url)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        pool = self.pool_for(url)
+        reader, writer = await pool.acquire(self.timeout)
+        reusable = False
+        try:
+            head = (f"{method} {target} HTTP/1.1\r\n"
+                    f"Host: {parts.netloc}\r\n"
+                    f"User-Agent: {self.settings['user_agent']}\r\n"
+                    "Accept: */*\r\n"
+                    f"Connection: {'keep-alive' if method == 'HEAD' else 'close'}\r\n\r\n")
+            writer.write(head.encode('latin-1'))
+            await writer.drain()
+            raw = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.timeout)
+            status_line, *header_lines = raw.decode('latin-1').split('\r\n')
+            version, status = status_line.split(' ', 2)[:2]
+            headers = {}
+            for line in header_lines:
+                if ':' in line:
+                    name, value = line.split(':', 1)
+                    headers[name.strip().lower()] = value.strip()
+            # HEAD responses carry no body, so the connection can be reused as is
+            reusable = (method == 'HEAD' and version == 'HTTP/1.1'
+                        and headers.get('connection', '').lower() != 'close')
+            return int(status), headers
+        finally:
+            pool.release((reader, writer), reusable)
+
+    async def check(self, url):
+        """Follow redirects and retry transient failures; returns a result dict."""
+        async with self.limit:
+            error = None
+            for attempt in range(self.settings['max_retries'] + 1):
+                if attempt:
+                    await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+                try:
+                    status = await self.follow(url)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                        asyncio.LimitOverrunError, ValueError) as e:
+                    error, status = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__, None
+                    continue
+                if status in RETRY_STATUSES:
+                    error = f"HTTP {status}"
+                    continue
+                return {'url': url, 'status': status, 'ok': status in self.accept, 'error': None}
+            return {'url': url, 'status': status, 'ok': False, 'error': error}
+
+    async def follow(self, url):
+        current = url
+        for _ in range(self.settings['max_redirects'] + 1):
+            status, headers = await self.request('HEAD', current)
+            if status in (403, 404, 405, 501):
+                # Plenty of servers answer HEAD differently from GET
+                status, headers = await self.request('GET', current)
+            if status not in REDIRECT_STATUSES or 'location' not in headers:
+                return status
+            current = urljoin(current, headers['location'])
+        return status
+
+    def close(self):
+        for pool in self.pools.values():
+            pool.close()
+
+
+async def check_urls(urls, settings, cache=None):
+    """Check external URLs, consulting and updating the cache; returns results by URL."""
+    results = {}
+    to_check = []
+    for url in urls:
+        cached = cache.get(url) if cache else None
+        if cached:
+            results[url] = {'url': url, 'status': cached['status'], 'ok': True, 'error': None, 'cached': True}
+        else:
+            to_check.append(url)
+
+    checker = LinkChecker(settings)
+    try:
+        for result in await asyncio.gather(*(checker.check(url) for url in to_check)):
+            results[result['url']] = result
+            if cache:
+                cache.put(result['url'], result)
+    finally:
+        checker.close()
+    return results
+
+
+def check_local(links, project_root):
+    """Local links must name an existing file (or a directory with an index.html)."""
+    results = {}
+    for link in links:
+        path = os.path.join(project_root, link)
+        ok = os.path.isfile(path) or os.path.isfile(os.path.join(path, 'index.html'))
+        results[link] = {'url': link, 'status': None, 'ok': ok, 'error': None if ok else 'file not found'}
+    return results
+
+
+def write_report(path, results, links):
+    """Write a Markdown summary in the spirit of lychee's report."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    broken = [r for r in results.values() if not r['ok']]
+    with open(path, 'w') as f:
+        f.write("# Link Check Summary\n\n")
+        f.write("| Status | Count |\n|---|---|\n")
+        f.write(f"| 🔍 Total | {len(results)} |\n")
+        f.write(f"| ✅ Successful | {len(results) - len(broken)} |\n")
+        f.write(f"| ♻️ Cached | {sum(1 for r in results.values() if r.get('cached'))} |\n")
+        f.write(f"| 🚫 Errors | {len(broken)} |\n")
+        if broken:
+            f.write("\n## Errors\n\n")
+            for r in sorted(broken, key=lambda r: r['url']):
+                sources = ', '.join(sorted(links.get(r['url'], ())))
+                f.write(f"* [{r['status'] or 'ERR'}] <{r['url']}> ({sources}) {r['error'] or ''}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the links published by the site')
+    parser.add_argument('--config', default='test/lychee.toml', help='lychee-style TOML settings')
+    parser.add_argument('--cache-ttl', type=float, default=86400, help='Seconds a passing result stays cached')
+    parser.add_argument('--cache-file', default='.linkcheck-cache.json', help='Result cache location')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the result cache')
+    parser.add_argument('urls', nargs='*', help='Check these URLs instead of the site links')
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+    os.chdir(project_root)
+
+    settings = load_settings(args.config)
+    links = {url: {'command line'} for url in args.urls} if args.urls else collect_links(project_root)
+    external = sorted(u for u in links if URL_PATTERN.match(u) and not is_excluded(u, settings['exclude']))
+    local = sorted(u for u in links if not URL_PATTERN.match(u))
+    excluded = len(links) - len(external) - len(local)
+
+    cache = None if args.no_cache else LinkCache(args.cache_file, args.cache_ttl)
+    print(f"🔗 Checking {len(external)} external and {len(local)} local link(s) "
+          f"({excluded} excluded, max concurrency {settings['max_concurrency']})")
+
+    started = time.perf_counter()
+    results = check_local(local, project_root)
+    results.update(asyncio.run(check_urls(external, settings, cache)))
+    if cache:
+        cache.save()
+    elapsed = time.perf_counter() - started
+
+    for result in sorted(results.values(), key=lambda r: r['url']):
+        if not result['ok']:
+            detail = result['error'] or f"HTTP {result['status']}"
+            print(f"❌ {result['url']} — {detail} (in {', '.join(sorted(links[result['url']]))})")
+
+    if settings['output']:
+        write_report(settings['output'], results, links)
+
+    broken = sum(1 for r in results.values() if not r['ok'])
+    cached = sum(1 for r in results.values() if r.get('cached'))
+    print(f"{'✅' if not broken else '❌'} {len(results) - broken}/{len(results)} links OK, "
+          f"{cached} from cache, {elapsed:.1f}s")
+    return 1 if broken else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Precompress text assets for the development server.
+Writes a .gz (and, when brotli is available, a .br) sibling next to every
+HTML/CSS/JS/JSON/XML/SVG/TXT file so serve.py can send the smallest variant
+the client accepts without compressing per request.
+
+Only files whose content hash changed since the last run are recompressed;
+hashes are kept in .precompress-manifest.json at the project root.
+
+Usage:
+    python3 _scripts/compress_assets.py [--force]
+"""
+
+import os
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+import argparse
+import subprocess
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TEXT_EXTENSIONS = {'.html', '.css', '.js', '.json', '.xml', '.svg', '.txt', '.webmanifest'}
+SKIP_DIRS = {'.git', '.github', '.idea', 'node_modules', '_scripts', 'test', 'test-reports',
+             'playwright-report', 'test-results', '.lighthouseci'}
+SKIP_FILES = {'package.json', 'package-lock.json', 'playwright.config.js'}
+MIN_SIZE = 256  # below this the headers outweigh any saving
+MANIFEST_NAME = '.precompress-manifest.json'
+
+
+def brotli_compress(data):
+    """Compress with the brotli module, or the brotli CLI if that is all there is."""
+    if brotli is not None:
+        return brotli.compress(data, quality=11)
+    cli = shutil.which('brotli')
+    if cli is None:
+        return None
+    result = subprocess.run([cli, '-c', '-q', '11', '-'], input=data, capture_output=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+ENCODERS = {
+    '.gz': lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+    '.br': brotli_compress,
+}
+
+
+def iter_text_assets(project_root):
+    """Yield project-relative paths of compressible files."""
+    for dirpath, dirnames, filenames in os.walk(project_root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for filename in sorted(filenames):
+            if filename.startswith('.') or filename in SKIP_FILES:
+                continue
+            if os.path.splitext(filename)[1] in TEXT_EXTENSIONS:
+                yield os.path.relpath(os.path.join(dirpath, filename), project_root)
+
+
+def remove_siblings(path):
+    for suffix in ENCODERS:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def write_siblings(path, data):
+    """Write each encoded variant that is actually smaller than the original."""
+    written = []
+    for suffix, encode in ENCODERS.items():
+        encoded = encode(data)
+        if encoded is None or len(encoded) >= len(data):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+            continue
+        tmp_path = path + suffix + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(encoded)
+        os.replace(tmp_path, path + suffix)
+        written.append(suffix)
+    return written
+
+
+def compress_assets(project_root, force=False):
+    """Bring every precompressed sibling up to date; returns (compressed, unchanged) counts."""
+    manifest_path = os.path.join(project_root, MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    # A newly installed encoder invalidates every entry
+    encodings = [suffix for suffix, encode in ENCODERS.items() if encode(b'probe') is not None]
+    previous_files = manifest.get('files', {}) if manifest.get('encodings') == encodings else {}
+    files = {}
+    compressed = unchanged = 0
+
+    for relpath in iter_text_assets(project_root):
+        path = os.path.join(project_root, relpath)
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+
+        if len(data) < MIN_SIZE:
+            remove_siblings(path)
+            files[relpath] = {'sha256': digest, 'written': []}
+            continue
+
+        previous = previous_files.get(relpath, {})
+        if (not force and previous.get('sha256') == digest
+                and all(os.path.exists(path + suffix) for suffix in previous.get('written', []))):
+            # Same content, maybe a newer mtime (git checkout): keep siblings fresh for serve.py
+            source_mtime = os.stat(path).st_mtime_ns
+            for suffix in previous['written']:
+                if os.stat(path + suffix).st_mtime_ns < source_mtime:
+                    os.utime(path + suffix, ns=(source_mtime, source_mtime))
+            files[relpath] = previous
+            unchanged += 1
+            continue
+
+        written = write_siblings(path, data)
+        files[relpath] = {'sha256': digest, 'written': written}
+        compressed += 1
+        print(f"🗜️  {relpath}: {', '.join(written) or 'no smaller variant'}")
+
+    # Drop variants of files that no longer exist
+    for relpath in manifest.get('files', {}).keys() - files.keys():
+        remove_siblings(os.path.join(project_root, relpath))
+
+    with open(manifest_path, 'w') as f:
+        json.dump({'encodings': encodings, 'files': files}, f, indent=2, sort_keys=True)
+
+    return compressed, unchanged
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write .gz/.br siblings for text assets')
+    parser.add_argument('--force', action='store_true', help='Recompress every file, ignoring the manifest')
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+
+    if brotli is None and shutil.which('brotli') is None:
+        print("ℹ️  brotli not available (pip install brotli); writing gzip only")
+
+    compressed, unchanged = compress_assets(project_root, force=args.force)
+    print(f"✅ Precompressed {compressed} file(s), {unchanged} unchanged")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,91 +1,129 @@
 #!/usr/bin/env python3
 
+import re
+import sys
 import json
-from xml.etree.ElementTree import Element, SubElement, tostring
+import html
+import time
+import hashlib
+import tempfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
 import zipfile
 import os
 
-def create_word_document():
-    # Get the script directory and project root
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    
-    # Read the site configuration
-    config_path = os.path.join(project_root, 'assets', 'data', 'site.config.json')
-    with open(config_path, 'r') as f:
-        data = json.load(f)
-    
-    # Create the main document XML structure
-    document = Element('w:document', {
-        'xmlns:w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
-    })
-    
-    body = SubElement(document, 'w:body')
-    
-    # Helper function to create a paragraph
-    def add_paragraph(parent, text, style='Normal'):
-        p = SubElement(parent, 'w:p')
-        pPr = SubElement(p, 'w:pPr')
-        pStyle = SubElement(pPr, 'w:pStyle')
-        pStyle.set('w:val', style)
-        r = SubElement(p, 'w:r')
-        t = SubElement(r, 'w:t')
-        t.text = text
-        return p
-    
-    # Helper function to create a heading
-    def add_heading(parent, text, level=1):
-        p = SubElement(parent, 'w:p')
-        pPr = SubElement(p, 'w:pPr')
-        pStyle = SubElement(pPr, 'w:pStyle')
-        pStyle.set('w:val', f'Heading{level}')
-        r = SubElement(p, 'w:r')
-        rPr = SubElement(r, 'w:rPr')
-        b = SubElement(rPr, 'w:b')
-        t = SubElement(r, 'w:t')
-        t.text = text
-        return p
-    
-    # Add header information
-    add_heading(body, data['name'], 1)
-    add_paragraph(body, data['role'])
-    add_paragraph(body, 'LinkedIn: linkedin.com/in/andrewnixdorf | GitHub: github.com/AndroidNextdoor')
-    add_paragraph(body, '')  # Empty line
-    
-    # Add professional summary
-    add_heading(body, 'PROFESSIONAL SUMMARY', 2)
-    add_paragraph(body, data['summary'])
-    add_paragraph(body, '')
-    
-    # Add professional experience
-    add_heading(body, 'PROFESSIONAL EXPERIENCE', 2)
-    for exp in data['experience']:
-        add_paragraph(body, f"{exp['title']} - {exp['company']} ({exp['period']})", 'Strong')
-        for highlight in exp['highlights']:
-            add_paragraph(body, f"• {highlight}")
-        add_paragraph(body, '')
-    
-    # Add key projects
-    add_heading(body, 'KEY PROJECTS', 2)
-    for project in data['projects']:
-        add_paragraph(body, project['title'], 'Strong')
-        add_paragraph(body, project['description'])
-        add_paragraph(body, f"Technologies: {', '.join(project['stack'])}")
-        add_paragraph(body, '')
-    
-    # Add certifications if they exist
-    if 'certifications' in data and data['certifications']:
-        add_heading(body, 'CERTIFICATIONS', 2)
-        for cert in data['certifications']:
-            add_paragraph(body, cert['name'], 'Strong')
-            add_paragraph(body, f"{cert['issuer']} - {cert['date']}")
-            add_paragraph(body, '')
-    
-    # Add skills
-    add_heading(body, 'CORE TECHNOLOGIES & SKILLS', 2)
-    add_paragraph(body, ', '.join(data['keywords']))
+from pdf_worker import ChromeWorker, ChromeError, find_chrome
+from site_config import CONFIG_PATH, ConfigError, load_site_config
+from validate_config import validate
+
+WORDPROCESSINGML_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+MANIFEST_NAME = '.resume-manifest.json'
+GENERATOR_FILES = ('create_resume.py', 'pdf_worker.py', 'site_config.py')
+# DOCX timestamp unless SOURCE_DATE_EPOCH is set; fixed so the output only
+# depends on the inputs, not on when or where it was built
+DEFAULT_BUILD_EPOCH = 1704110400  # 2024-01-01T12:00:00Z
+
+class DocumentWriter:
+    """Streams WordprocessingML paragraphs into a binary stream.
+
+    Each paragraph is serialized as soon as it is added and written out in
+    chunks of up to buffer_size bytes, so memory use does not grow with the
+    document. The markup matches what ElementTree produced for the old
+    in-memory tree.
+    """
+
+    def __init__(self, stream, buffer_size=64 * 1024):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._chunks = []
+        self._buffered = 0
+
+    def __enter__(self):
+        self._write(f'<w:document xmlns:w="{WORDPROCESSINGML_NS}"><w:body>')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._write('</w:body></w:document>')
+        self.flush()
+
+    def add_paragraph(self, text, style='Normal'):
+        self._write(f'<w:p><w:pPr><w:pStyle w:val="{escape(style, {chr(34): "&quot;"})}" /></w:pPr>'
+                    f'<w:r>{self._text(text)}</w:r></w:p>')
+
+    def add_heading(self, text, level=1):
+        self._write(f'<w:p><w:pPr><w:pStyle w:val="Heading{level}" /></w:pPr>'
+                    f'<w:r><w:rPr><w:b /></w:rPr>{self._text(text)}</w:r></w:p>')
+
+    def flush(self):
+        if self._chunks:
+            self.stream.write(''.join(self._chunks).encode('utf-8'))
+            self._chunks.clear()
+            self._buffered = 0
+
+    @staticmethod
+    def _text(text):
+        return f'<w:t>{escape(text)}</w:t>' if text else '<w:t />'
+
+    def _write(self, markup):
+        self._chunks.append(markup)
+        self._buffered += len(markup)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+def zip_entry(name, epoch=DEFAULT_BUILD_EPOCH):
+    """A ZipInfo with a fixed timestamp and mode, so the archive bytes are reproducible."""
+    # Zip timestamps cannot predate 1980
+    info = zipfile.ZipInfo(name, max(time.gmtime(epoch)[:6], (1980, 1, 1, 0, 0, 0)))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    return info
+
+def create_word_document(docx, data=None, epoch=DEFAULT_BUILD_EPOCH):
+    """Stream the resume body into word/document.xml of an open DOCX ZipFile."""
+    if data is None:
+        data = load_site_config()
     
-    return tostring(document, encoding='unicode')
+    with docx.open(zip_entry('word/document.xml', epoch), 'w') as stream, DocumentWriter(stream) as doc:
+        # Add header information
+        doc.add_heading(data['name'], 1)
+        doc.add_paragraph(data['role'])
+        doc.add_paragraph('LinkedIn: linkedin.com/in/andrewnixdorf | GitHub: github.com/AndroidNextdoor')
+        doc.add_paragraph('')  # Empty line
+        
+        # Add professional summary
+        doc.add_heading('PROFESSIONAL SUMMARY', 2)
+        doc.add_paragraph(data['summary'])
+        doc.add_paragraph('')
+        
+        # Add professional experience
+        doc.add_heading('PROFESSIONAL EXPERIENCE', 2)
+        for exp in data['experience']:
+            doc.add_paragraph(f"{exp['title']} - {exp['company']} ({exp['period']})", 'Strong')
+            for highlight in exp['highlights']:
+                doc.add_paragraph(f"• {highlight}")
+            doc.add_paragraph('')
+        
+        # Add key projects
+        doc.add_heading('KEY PROJECTS', 2)
+        for project in data['projects']:
+            doc.add_paragraph(project['title'], 'Strong')
+            doc.add_paragraph(project['description'])
+            doc.add_paragraph(f"Technologies: {', '.join(project['stack'])}")
+            doc.add_paragraph('')
+        
+        # Add certifications if they exist
+        if 'certifications' in data and data['certifications']:
+            doc.add_heading('CERTIFICATIONS', 2)
+            for cert in data['certifications']:
+                doc.add_paragraph(cert['name'], 'Strong')
+                doc.add_paragraph(f"{cert['issuer']} - {cert['date']}")
+                doc.add_paragraph('')
+        
+        # Add skills
+        doc.add_heading('CORE TECHNOLOGIES & SKILLS', 2)
+        doc.add_paragraph(', '.join(data['keywords']))
 
 def create_content_types():
     return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
@@ -107,13 +145,14 @@ def create_app_props():
     <AppVersion>16.0000</AppVersion>
 </Properties>'''
 
-def create_core_props():
-    return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+def create_core_props(epoch=DEFAULT_BUILD_EPOCH):
+    timestamp = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(epoch))
+    return f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" xmlns:dcmitype="http://purl.org/dc/dcmitype/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
     <dc:title>Andrew Nixdorf - Resume</dc:title>
     <dc:creator>Andrew Nixdorf</dc:creator>
-    <dcterms:created xsi:type="dcterms:W3CDTF">2024-01-01T12:00:00Z</dcterms:created>
-    <dcterms:modified xsi:type="dcterms:W3CDTF">2024-01-01T12:00:00Z</dcterms:modified>
+    <dcterms:created xsi:type="dcterms:W3CDTF">{timestamp}</dcterms:created>
+    <dcterms:modified xsi:type="dcterms:W3CDTF">{timestamp}</dcterms:modified>
 </cp:coreProperties>'''
 
 def create_main_rels():
@@ -199,55 +238,277 @@ def create_styles():
     </w:style>
 </w:styles>'''
 
-def create_pdf_resume(project_root):
-    import subprocess
+def create_pdf_resume(project_root, chrome=None):
+    """Print resume.html to PDF, reusing a running ChromeWorker when one is passed in."""
     html_path = os.path.join(project_root, 'resume.html')
     pdf_path = os.path.join(project_root, 'assets', 'andrew-nixdorf-resume.pdf')
     
-    # Ensure assets directory exists
-    os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
-    
-    # Try different Chrome/Chromium paths for different environments
-    chrome_paths = [
-        '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',  # macOS
-        '/usr/bin/google-chrome',  # Linux
-        '/usr/bin/chromium-browser',  # Linux alternative
-        'google-chrome',  # PATH
-        'chromium'  # PATH alternative
-    ]
-    
-    chrome_cmd = None
-    for path in chrome_paths:
-        try:
-            if os.path.exists(path) or subprocess.run(['which', path.split('/')[-1]], 
-                                                    capture_output=True, check=True):
-                chrome_cmd = path
-                break
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            continue
-    
-    if not chrome_cmd:
+    if chrome is None and find_chrome() is None:
         print("⚠️  Chrome/Chromium not found. Skipping PDF generation.")
         return False
     
-    # Use Chrome to convert HTML to PDF
-    cmd = [
-        chrome_cmd,
-        '--headless', '--disable-gpu', '--no-sandbox',
-        f'--print-to-pdf={pdf_path}',
-        '--print-to-pdf-no-header', '--no-margins',
-        f'file://{html_path}'
-    ]
-    
     try:
-        subprocess.run(cmd, check=True, capture_output=True)
+        if chrome is None:
+            with ChromeWorker() as chrome:
+                chrome.print_to_pdf(html_path, pdf_path)
+        else:
+            chrome.print_to_pdf(html_path, pdf_path)
         print(f"PDF resume created successfully at: {pdf_path}")
         return True
-    except subprocess.CalledProcessError as e:
+    except ChromeError as e:
         print(f"Error creating PDF: {e}")
         return False
 
+STATIC_PARTS = (
+    ('[Content_Types].xml', create_content_types),
+    ('docProps/app.xml', create_app_props),
+    ('docProps/core.xml', create_core_props),
+    ('_rels/.rels', create_main_rels),
+    ('word/_rels/document.xml.rels', create_document_rels),
+    ('word/styles.xml', create_styles),
+)
+
+def create_static_parts(epoch=DEFAULT_BUILD_EPOCH):
+    """Encode the parts that are identical in every DOCX of one build, once."""
+    parts = {name: build() for name, build in STATIC_PARTS}
+    parts['docProps/core.xml'] = create_core_props(epoch)
+    return {name: content.encode('utf-8') for name, content in parts.items()}
+
+def write_docx(docx_path, data=None, static_parts=None, epoch=DEFAULT_BUILD_EPOCH):
+    """Write one DOCX: the streamed body plus the shared static parts."""
+    if static_parts is None:
+        static_parts = create_static_parts(epoch)
+    tmp_path = f'{docx_path}.tmp'
+    with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as docx:
+        # Stream the main document straight into its zip entry
+        create_word_document(docx, data, epoch)
+        
+        # Add required files
+        for name, content in static_parts.items():
+            docx.writestr(zip_entry(name, epoch), content)
+    os.replace(tmp_path, docx_path)
+
+def sha256_file(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def generator_version():
+    """Hash of the generator sources; editing them invalidates every recorded output."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in GENERATOR_FILES:
+        with open(os.path.join(script_dir, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def build_epoch():
+    """DOCX timestamp: SOURCE_DATE_EPOCH, else DEFAULT_BUILD_EPOCH."""
+    if os.environ.get('SOURCE_DATE_EPOCH'):
+        return int(os.environ['SOURCE_DATE_EPOCH'])
+    return DEFAULT_BUILD_EPOCH
+
+class BuildManifest:
+    """Input hashes, generator version and output hash of every generated file.
+
+    An output is up to date when its recorded inputs and generator match the
+    current ones and the file on disk still has the recorded hash.
+    """
+
+    def __init__(self, project_root):
+        self.project_root = project_root
+        self.path = os.path.join(project_root, MANIFEST_NAME)
+        try:
+            with open(self.path, 'r') as f:
+                self.outputs = json.load(f).get('outputs', {})
+        except (OSError, ValueError):
+            self.outputs = {}
+
+    def _key(self, output_path):
+        return os.path.relpath(output_path, self.project_root)
+
+    def hash_inputs(self, relpaths):
+        return {relpath: sha256_file(os.path.join(self.project_root, relpath)) for relpath in relpaths}
+
+    def up_to_date(self, output_path, record):
+        entry = self.outputs.get(self._key(output_path))
+        if entry is None or {key: entry.get(key) for key in record} != record:
+            return False
+        try:
+            return sha256_file(output_path) == entry.get('output')
+        except OSError:
+            return False
+
+    def record(self, output_path, record):
+        self.outputs[self._key(output_path)] = {**record, 'output': sha256_file(output_path)}
+
+    def save(self):
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'outputs': self.outputs}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+def create_resume_html(data, style):
+    """Render a profile with the markup and styles of resume.html, for PDF printing."""
+    e = html.escape
+    parts = [
+        f'<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8">'
+        f'<title>{e(data["name"])} - Resume</title><style>{style}</style></head><body>',
+        f'<div class="header"><h1>{e(data["name"])}</h1><div class="role">{e(data["role"])}</div>'
+        f'<div class="contact">LinkedIn: linkedin.com/in/andrewnixdorf | GitHub: github.com/AndroidNextdoor</div></div>',
+        f'<div class="section"><h2>Professional Summary</h2><div class="summary">{e(data["summary"])}</div></div>',
+        '<div class="section"><h2>Professional Experience</h2>',
+    ]
+    for exp in data['experience']:
+        highlights = ''.join(f'<li>{e(h)}</li>' for h in exp['highlights'])
+        parts.append(
+            f'<div class="experience-item"><div class="experience-header"><div>'
+            f'<div class="experience-title">{e(exp["title"])}</div><div class="company">{e(exp["company"])}</div>'
+            f'</div><div class="period">{e(exp["period"])}</div></div><ul class="highlights">{highlights}</ul></div>')
+    parts.append('</div><div class="section"><h2>Key Projects</h2>')
+    for project in data['projects']:
+        stack = ''.join(f'<span class="stack-tag">{e(tag)}</span>' for tag in project['stack'])
+        parts.append(
+            f'<div class="project-item"><div class="project-header"><div class="project-title">{e(project["title"])}'
+            f'</div></div><div class="project-description">{e(project["description"])}</div>'
+            f'<div class="project-stack">{stack}</div></div>')
+    skills = ''.join(f'<span class="skill-tag">{e(keyword)}</span>' for keyword in data['keywords'])
+    parts.append(f'</div><div class="section"><h2>Core Technologies &amp; Skills</h2><div class="skills">{skills}</div></div>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+def load_profiles(source, base):
+    """Yield (slug, config) for each profile in a directory of .json files or a .jsonl file.
+
+    Profiles are shallow overrides of the base site config, so a profile only
+    needs the keys it tailors (role, summary, keywords, ...).
+    """
+    if os.path.isdir(source):
+        for filename in sorted(os.listdir(source)):
+            if filename.endswith('.json'):
+                with open(os.path.join(source, filename), 'r') as f:
+                    yield os.path.splitext(filename)[0], {**base, **json.load(f)}
+        return
+    with open(source, 'r') as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                profile = json.loads(line)
+                yield profile.pop('slug', None) or f'profile-{number}', {**base, **profile}
+
+_static_parts = None
+_epoch = DEFAULT_BUILD_EPOCH
+
+def _init_worker(static_parts, epoch):
+    global _static_parts, _epoch
+    _static_parts = static_parts
+    _epoch = epoch
+
+def _render_profile(job):
+    slug, data, docx_path = job
+    started = time.perf_counter()
+    write_docx(docx_path, data, _static_parts, _epoch)
+    return slug, docx_path, time.perf_counter() - started
+
+def generate_batch(project_root, source, out_dir, jobs=None, pdf=False, force=False):
+    """Render a DOCX (and optionally a PDF) per changed profile across a process pool."""
+    try:
+        base = load_site_config(project_root)
+    except ConfigError as e:
+        print(f"❌ {CONFIG_PATH} is invalid:")
+        for error in e.errors:
+            print(f"  • {error}")
+        return False
+    profiles = list(load_profiles(source, base))
+    if not profiles:
+        print(f"⚠️  No profiles found in {source}")
+        return False
+    invalid = [(slug, errors) for slug, data in profiles if (errors := validate(data))]
+    for slug, errors in invalid:
+        print(f"❌ Profile {slug} is invalid:")
+        for error in errors:
+            print(f"  • {error}")
+    if invalid:
+        return False
+    os.makedirs(out_dir, exist_ok=True)
+    
+    manifest = BuildManifest(project_root)
+    generator = generator_version()
+    epoch = build_epoch()
+    tasks, stale = [], []
+    for slug, data in profiles:
+        slug = re.sub(r'[^A-Za-z0-9._-]+', '-', slug).strip('-')
+        profile_hash = hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+        task = (slug, data, os.path.join(out_dir, f'andrew-nixdorf-resume-{slug}.docx'))
+        record = {'generator': generator, 'epoch': epoch, 'inputs': {'profile': profile_hash}}
+        tasks.append((task, record))
+        if force or not manifest.up_to_date(task[2], record):
+            stale.append((task, record))
+    
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(create_static_parts(epoch), epoch)) as pool:
+        for (slug, docx_path, seconds), (_, record) in zip(pool.map(_render_profile, [t for t, _ in stale]), stale):
+            manifest.record(docx_path, record)
+            print(f"📄 {slug}: {docx_path} ({seconds * 1000:.1f} ms)")
+    elapsed = time.perf_counter() - started
+    rate = f" ({len(stale) / elapsed:.1f} docs/s)" if stale else ""
+    print(f"✅ {len(stale)} DOCX resume(s) in {elapsed:.2f}s{rate}, {len(tasks) - len(stale)} up to date")
+    manifest.save()
+    
+    if not pdf:
+        return True
+    if find_chrome() is None:
+        print("⚠️  Chrome/Chromium not found. Skipping PDF generation.")
+        return False
+    
+    with open(os.path.join(project_root, 'resume.html'), 'r') as f:
+        style = re.search(r'<style>(.*?)</style>', f.read(), re.S).group(1)
+    style_hash = hashlib.sha256(style.encode('utf-8')).hexdigest()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_jobs, pdf_records = [], []
+        for (slug, data, docx_path), record in tasks:
+            pdf_path = os.path.splitext(docx_path)[0] + '.pdf'
+            pdf_record = {'generator': generator, 'chrome': find_chrome(),
+                          'inputs': {**record['inputs'], 'style': style_hash}}
+            if not force and manifest.up_to_date(pdf_path, pdf_record):
+                continue
+            html_path = os.path.join(tmp_dir, f'{slug}.html')
+            with open(html_path, 'w') as f:
+                f.write(create_resume_html(data, style))
+            pdf_jobs.append((html_path, pdf_path))
+            pdf_records.append(pdf_record)
+        
+        errors = []
+        started = time.perf_counter()
+        if pdf_jobs:
+            try:
+                with ChromeWorker() as chrome:
+                    errors = chrome.print_batch(pdf_jobs)
+            except ChromeError as e:
+                print(f"Error creating PDF: {e}")
+                return False
+        elapsed = time.perf_counter() - started
+    
+    for (_, pdf_path), pdf_record, error in zip(pdf_jobs, pdf_records, errors):
+        if error:
+            print(f"❌ {pdf_path}: {error}")
+            continue
+        manifest.record(pdf_path, pdf_record)
+        print(f"📄 {pdf_path}")
+    manifest.save()
+    rate = f" ({len(pdf_jobs) / elapsed:.1f} docs/s)" if pdf_jobs else ""
+    print(f"✅ {errors.count(None)} PDF resume(s) in {elapsed:.2f}s{rate}, {len(tasks) - len(pdf_jobs)} up to date")
+    return not any(errors)
+
 def main():
+    parser = argparse.ArgumentParser(description='Generate DOCX and PDF resumes from site.config.json')
+    parser.add_argument('--batch', metavar='PATH',
+                        help='Directory of profile .json files or a .jsonl file; renders one resume per profile')
+    parser.add_argument('--out-dir', help='Output directory for --batch (default: assets/resumes)')
+    parser.add_argument('--jobs', type=int, help='Worker processes for --batch (default: CPU count)')
+    parser.add_argument('--pdf', action='store_true', help='Also print a PDF per profile in --batch mode')
+    parser.add_argument('--force', action='store_true', help='Regenerate every output, ignoring the build manifest')
+    args = parser.parse_args()
+    
     # Get the script directory and project root
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
@@ -256,26 +517,43 @@ def main():
     assets_dir = os.path.join(project_root, 'assets')
     os.makedirs(assets_dir, exist_ok=True)
     
-    docx_path = os.path.join(assets_dir, 'andrew-nixdorf-resume.docx')
+    if args.batch:
+        out_dir = args.out_dir or os.path.join(assets_dir, 'resumes')
+        return 0 if generate_batch(project_root, args.batch, out_dir, args.jobs, args.pdf, args.force) else 1
     
-    # Create the DOCX file
-    with zipfile.ZipFile(docx_path, 'w', zipfile.ZIP_DEFLATED) as docx:
-        # Add the main document
-        document_xml = create_word_document()
-        docx.writestr('word/document.xml', document_xml)
-        
-        # Add required files
-        docx.writestr('[Content_Types].xml', create_content_types())
-        docx.writestr('docProps/app.xml', create_app_props())
-        docx.writestr('docProps/core.xml', create_core_props())
-        docx.writestr('_rels/.rels', create_main_rels())
-        docx.writestr('word/_rels/document.xml.rels', create_document_rels())
-        docx.writestr('word/styles.xml', create_styles())
+    # Catch bad shapes here rather than as a KeyError halfway through the DOCX
+    try:
+        data = load_site_config(project_root)
+    except ConfigError as e:
+        print(f"❌ {CONFIG_PATH} is invalid:")
+        for error in e.errors:
+            print(f"  • {error}")
+        return 1
     
-    print(f"DOCX resume created successfully at: {docx_path}")
+    docx_path = os.path.join(assets_dir, 'andrew-nixdorf-resume.docx')
+    pdf_path = os.path.join(assets_dir, 'andrew-nixdorf-resume.pdf')
+    manifest = BuildManifest(project_root)
+    generator = generator_version()
+    epoch = build_epoch()
+    
+    # Create the DOCX file unless the config and generator are unchanged
+    docx_record = {'generator': generator, 'epoch': epoch, 'inputs': manifest.hash_inputs([CONFIG_PATH])}
+    if not args.force and manifest.up_to_date(docx_path, docx_record):
+        print(f"✅ DOCX resume up to date: {docx_path}")
+    else:
+        write_docx(docx_path, data, epoch=epoch)
+        manifest.record(docx_path, docx_record)
+        print(f"DOCX resume created successfully at: {docx_path}")
     
     # Also create PDF version
-    create_pdf_resume(project_root)
+    pdf_record = {'generator': generator, 'chrome': find_chrome(), 'inputs': manifest.hash_inputs(['resume.html'])}
+    if not args.force and manifest.up_to_date(pdf_path, pdf_record):
+        print(f"✅ PDF resume up to date: {pdf_path}")
+    elif create_pdf_resume(project_root):
+        manifest.record(pdf_path, pdf_record)
+    
+    manifest.save()
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
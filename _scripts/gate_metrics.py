@@ -0,0 +1,244 @@
+"""
+Command execution and metrics for the quality gates in run_tests.py.
+Every command a gate runs is started through run_measured(), which streams
+its output to a log file and the console as it arrives, enforces a timeout
+on its whole process group, and reaps the child with os.wait4() to get
+wall time, user/sys CPU, peak RSS and exit status for that one command
+(getrusage(RUSAGE_CHILDREN) only has totals for the whole process, and
+gates run concurrently). Each command is appended to
+test-reports/metrics/commands.jsonl as it finishes; summary.json adds the
+per-gate totals and, given a baseline summary from an earlier run, the gates
+that got slower or bigger.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import threading
+import subprocess
+
+METRICS_DIR = os.path.join('test-reports', 'metrics')
+# metric -> (ratio, minimum absolute increase) before a change counts as a regression,
+# so sub-second gates do not flag on scheduler noise
+REGRESSION_THRESHOLDS = {
+    'wall_s': (1.25, 1.0),
+    'cpu_s': (1.25, 1.0),
+    'max_rss_mb': (1.25, 16.0),
+}
+# ru_maxrss is in kilobytes on Linux and bytes on macOS
+RSS_DIVISOR = 1024 * 1024 if sys.platform == 'darwin' else 1024
+# Seconds between SIGTERM and SIGKILL for a command that timed out
+KILL_GRACE = 5.0
+
+# Process groups of the commands currently running
+_running = set()
+_running_lock = threading.Lock()
+
+
+class MetricsLog:
+    """Collects command and gate metrics from every gate thread."""
+
+    def __init__(self):
+        self.directory = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.commands = []
+        self.gate_wall = {}
+        self.started = time.time()
+
+    def open(self, directory=METRICS_DIR):
+        """Start a new run, replacing the previous run's files."""
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        open(os.path.join(directory, 'commands.jsonl'), 'w').close()
+        self.started = time.time()
+
+    def set_gate(self, name):
+        """Attribute commands started on this thread to the named gate."""
+        self.local.gate = name
+
+    def record_command(self, record):
+        record['gate'] = getattr(self.local, 'gate', None)
+        with self.lock:
+            self.commands.append(record)
+            if self.directory:
+                with open(os.path.join(self.directory, 'commands.jsonl'), 'a') as f:
+                    f.write(json.dumps(record) + '\n')
+
+    def record_gate(self, name, wall_s):
+        with self.lock:
+            self.gate_wall[name] = wall_s
+
+    def summarize(self, results, cached=()):
+        """Per-gate totals for (name, status) results, in run order."""
+        gates = {}
+        for name, status in results:
+            commands = [c for c in self.commands if c['gate'] == name]
+            user_s = sum(c['user_s'] for c in commands)
+            sys_s = sum(c['sys_s'] for c in commands)
+            gates[name] = {
+                'status': status,
+                'cached': name in cached,
+                'wall_s': round(self.gate_wall.get(name, 0.0), 3),
+                'user_s': round(user_s, 3),
+                'sys_s': round(sys_s, 3),
+                'cpu_s': round(user_s + sys_s, 3),
+                'max_rss_mb': max((c['max_rss_mb'] for c in commands), default=0.0),
+                'commands': len(commands),
+                'exit_statuses': [c['exit_status'] for c in commands],
+            }
+        return {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(self.started)),
+            'wall_s': round(time.time() - self.started, 3),
+            'gates': gates,
+        }
+
+    def write_summary(self, summary):
+        if not self.directory:
+            return None
+        path = os.path.join(self.directory, 'summary.json')
+        with open(path, 'w') as f:
+            json.dump(summary, f, indent=2)
+            f.write('\n')
+        return path
+
+
+metrics = MetricsLog()
+
+
+def _signal_group(pgid, sig):
+    try:
+        os.killpg(pgid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def stop_running_commands():
+    """SIGTERM every command still running; they do not get the terminal's Ctrl+C."""
+    with _running_lock:
+        for pgid in list(_running):
+            _signal_group(pgid, signal.SIGTERM)
+
+
+def run_measured(cmd, cwd=None, timeout=None, log_path=None, on_line=None):
+    """Run a shell command, streaming its output, and record its metrics.
+
+    stdout and stderr are drained line by line as they arrive: each line is
+    appended to log_path (if given) and passed to on_line(text) (if given),
+    so nothing accumulates in memory. The command runs in its own process
+    group; on timeout the whole group gets SIGTERM, then SIGKILL after
+    KILL_GRACE seconds, so tools started by the shell go too.
+
+    Raises subprocess.TimeoutExpired like subprocess.run; the command is
+    recorded either way. Returns a CompletedProcess (without output) that
+    carries the record as .metrics.
+    """
+    started_at = time.time()
+    started = time.perf_counter()
+    log = open(log_path, 'ab') if log_path else None
+    if log:
+        log.write(f'$ {cmd}\n'.encode('utf-8'))
+        log.flush()
+    process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               cwd=cwd, start_new_session=True)
+    pgid = process.pid
+    with _running_lock:
+        _running.add(pgid)
+    log_lock = threading.Lock()
+
+    def drain(stream):
+        for raw in iter(stream.readline, b''):
+            if log:
+                with log_lock:
+                    log.write(raw)
+                    log.flush()
+            if on_line:
+                on_line(raw.decode('utf-8', errors='replace').rstrip('\r\n'))
+        stream.close()
+
+    readers = [threading.Thread(target=drain, args=(stream,), daemon=True)
+               for stream in (process.stdout, process.stderr)]
+    for reader in readers:
+        reader.start()
+
+    # The timer must not signal a group whose leader wait4 has already reaped
+    reaped = threading.Lock()
+    timed_out = []
+
+    def expire():
+        with reaped:
+            if process.returncode is None:
+                timed_out.append(True)
+                _signal_group(pgid, signal.SIGTERM)
+                killer = threading.Timer(KILL_GRACE, _signal_group, (pgid, signal.SIGKILL))
+                killer.daemon = True
+                killer.start()
+
+    timer = threading.Timer(timeout, expire) if timeout else None
+    if timer:
+        timer.daemon = True
+        timer.start()
+    try:
+        _, status, usage = os.wait4(process.pid, 0)
+        with reaped:
+            process.returncode = os.waitstatus_to_exitcode(status)
+    finally:
+        if timer:
+            timer.cancel()
+        with _running_lock:
+            _running.discard(pgid)
+    wall_s = time.perf_counter() - started
+    for reader in readers:
+        # Background processes the command left behind may keep the pipes open
+        reader.join(KILL_GRACE + 1 if timed_out else None)
+    if log:
+        log.close()
+
+    record = {
+        'command': cmd,
+        'started': round(started_at, 3),
+        'wall_s': round(wall_s, 3),
+        'user_s': round(usage.ru_utime, 3),
+        'sys_s': round(usage.ru_stime, 3),
+        'max_rss_mb': round(usage.ru_maxrss / RSS_DIVISOR, 1),
+        'exit_status': process.returncode,
+        'timed_out': bool(timed_out),
+    }
+    metrics.record_command(record)
+    if timed_out:
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    result = subprocess.CompletedProcess(cmd, process.returncode)
+    result.metrics = record
+    return result
+
+
+def format_usage(record):
+    return (f"{record['wall_s']:.2f}s wall, {record['user_s'] + record['sys_s']:.2f}s CPU, "
+            f"{record['max_rss_mb']:.0f} MB peak")
+
+
+def load_baseline(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compare_to_baseline(summary, baseline):
+    """Return regressions as dicts of gate, metric, baseline and current values.
+
+    Only gates that actually ran in both runs are compared; cached and
+    skipped gates say nothing about how long the gate takes.
+    """
+    regressions = []
+    for name, current in summary['gates'].items():
+        previous = baseline.get('gates', {}).get(name)
+        if not previous or current['cached'] or previous.get('cached'):
+            continue
+        if current['status'] not in ('pass', 'fail') or previous.get('status') not in ('pass', 'fail'):
+            continue
+        for metric, (ratio, minimum) in REGRESSION_THRESHOLDS.items():
+            old, new = previous.get(metric, 0.0), current[metric]
+            if new > old * ratio and new - old >= minimum:
+                regressions.append({'gate': name, 'metric': metric, 'baseline': old, 'current': new})
+    return regressions
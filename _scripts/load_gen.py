@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+HTTP Load Generator
+===================
+Drives the static server with an asyncio HTTP/1.1 client and reports
+throughput and latency percentiles as JSON. No threads or third-party
+packages: every connection is a coroutine on one event loop.
+
+Two load models:
+    closed      --connections clients each send a request as soon as their
+                previous response arrives, so the server sets the pace
+                (measures capacity)
+    fixed-rate  requests are started at --rate per second whatever the
+                server does, over a pool of --connections connections;
+                latency is measured from when a request was due, so time
+                spent queued behind a slow response counts (no coordinated
+                omission)
+
+The URL mix is "/", the same-origin preloads in index.html and the pages in
+sitemap.xml, requested at random (or --paths). Without --url, serve.py is
+started on a free port for the run.
+
+Usage:
+    python3 _scripts/load_gen.py [--url http://localhost:8000] [--mode closed]
+                                 [--connections 16] [--rate 500] [--duration 10]
+                                 [--output results.json] [--baseline load-baseline.json]
+
+Options:
+    --url             Server to load; default: start serve.py (--serve-mode) for the run
+    --serve-mode      Concurrency mode of the started server (default: threaded)
+    --mode            closed or fixed-rate (default: closed)
+    --connections     Concurrent connections (default: 16)
+    --rate            Requests per second in fixed-rate mode (default: 200)
+    --duration        Seconds of measured load (default: 10)
+    --warmup          Seconds of load before measuring starts (default: 1)
+    --no-keep-alive   Open a new connection for every request
+    --timeout         Seconds before a request counts as an error (default: 10)
+    --paths           URL paths to request instead of the discovered mix
+    --seed            Seed for the URL mix (default: 0)
+    --output          Also write the JSON results to this file
+    --json            Print the JSON results instead of a summary
+    --baseline        Compare with earlier results; exit 1 on a regression
+    --save-baseline   Copy the results to this path
+    --max-error-rate  Fraction of failed requests tolerated (default: 0.01)
+"""
+
+import os
+import sys
+import json
+import time
+import re
+import random
+import select
+import asyncio
+import argparse
+import subprocess
+import urllib.parse
+import xml.etree.ElementTree as ElementTree
+from html.parser import HTMLParser
+from pathlib import Path
+
+from serve import MODES
+
+LOAD_MODES = ('closed', 'fixed-rate')
+DEFAULT_CONNECTIONS = 16
+DEFAULT_RATE = 200.0
+DEFAULT_DURATION = 10.0
+DEFAULT_WARMUP = 1.0
+DEFAULT_TIMEOUT = 10.0
+USER_AGENT = 'load_gen/1.0'
+# metric -> (direction that is worse, ratio, minimum absolute change) before a
+# change counts as a regression; latencies of a few ms jitter a lot
+REGRESSION_THRESHOLDS = {
+    'rps': ('lower', 0.8, 50.0),
+    'p50_ms': ('higher', 1.5, 1.0),
+    'p95_ms': ('higher', 1.5, 2.0),
+    'p99_ms': ('higher', 1.5, 5.0),
+}
+# Results are only comparable when these settings (and the path mix) match
+COMPARABLE_SETTINGS = ('mode', 'connections', 'rate', 'keep_alive')
+# Content hash in fingerprinted names (site.config.critical.<hash>.json)
+FINGERPRINT = re.compile(r'\.[0-9a-f]{8,}(?=\.[A-Za-z0-9]+$)')
+
+
+class PreloadParser(HTMLParser):
+    """Collects the href of every <link rel="preload">."""
+
+    def __init__(self):
+        super().__init__()
+        self.hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'link' and 'preload' in (attrs.get('rel') or '').split() and attrs.get('href'):
+            self.hrefs.append(attrs['href'])
+
+
+def discover_paths(project_root):
+    """The URL mix: "/", same-origin preloads from index.html and sitemap.xml pages."""
+    root = Path(project_root)
+    urls = ['/']
+    try:
+        parser = PreloadParser()
+        parser.feed((root / 'index.html').read_text(encoding='utf-8'))
+        # Absolute preloads (fonts and the like) are other hosts' load
+        urls += [urllib.parse.urljoin('/', href) for href in parser.hrefs
+                 if not urllib.parse.urlsplit(href).netloc]
+    except OSError:
+        pass
+    try:
+        sitemap = ElementTree.parse(root / 'sitemap.xml')
+        # The sitemap lists this site's pages under their public origin
+        urls += [loc.text.strip() for loc in sitemap.iter() if loc.tag.endswith('}loc') and loc.text]
+    except (OSError, ElementTree.ParseError):
+        pass
+
+    paths = []
+    for url in urls:
+        parts = urllib.parse.urlsplit(url)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+class HTTPConnection:
+    """One HTTP/1.1 client connection on the event loop, reopened as needed."""
+
+    def __init__(self, host, port, keep_alive=True, timeout=DEFAULT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def request(self, path):
+        """GET path; returns (status, body bytes)."""
+        reused = self.writer is not None
+        try:
+            return await asyncio.wait_for(self._exchange(path), self.timeout)
+        except asyncio.IncompleteReadError as e:
+            await self.close()
+            if reused and not e.partial:
+                # The server closed the idle connection before we wrote; retry once
+                return await asyncio.wait_for(self._exchange(path), self.timeout)
+            raise
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _exchange(self, path):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        connection = '' if self.keep_alive else 'Connection: close\r\n'
+        self.writer.write((f'GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n'
+                           f'User-Agent: {USER_AGENT}\r\nAccept-Encoding: br, gzip\r\n'
+                           f'{connection}\r\n').encode('latin-1'))
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        version, status = status_line.split(' ', 2)[:2]
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(':')
+            if name:
+                headers[name.strip().lower()] = value.strip()
+
+        if 'content-length' in headers:
+            size = int(headers['content-length'])
+            await self.reader.readexactly(size)
+        else:
+            size = len(await self.reader.read())
+            headers['connection'] = 'close'
+        if (not self.keep_alive or headers.get('connection', '').lower() == 'close'
+                or (version == 'HTTP/1.0' and headers.get('connection', '').lower() != 'keep-alive')):
+            await self.close()
+        return int(status), size
+
+    async def close(self):
+        if self.writer is not None:
+            writer, self.reader, self.writer = self.writer, None, None
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (OSError, asyncio.CancelledError):
+                pass
+
+
+class LoadStats:
+    """Latencies and outcomes of the requests that started in the measured window."""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = {}
+        self.paths = {}
+        self.bytes = 0
+
+    def record(self, path, status, size, seconds):
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.paths[path] = self.paths.get(path, 0) + 1
+        self.bytes += size
+        if status >= 400:
+            self.error(f'HTTP {status}')
+        else:
+            self.latencies.append(seconds)
+
+    def error(self, kind):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def summary(self, elapsed):
+        latencies = sorted(self.latencies)
+        errors = sum(self.errors.values())
+        total = len(latencies) + errors
+        ms = lambda seconds: round(seconds * 1000, 2)
+        return {
+            'requests': total,
+            'errors': errors,
+            'error_rate': round(errors / total, 4) if total else 0.0,
+            'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            'bytes_per_s': round(self.bytes / elapsed) if elapsed else 0,
+            'mean_ms': ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+            'p50_ms': ms(percentile(latencies, 50)),
+            'p95_ms': ms(percentile(latencies, 95)),
+            'p99_ms': ms(percentile(latencies, 99)),
+            'max_ms': ms(latencies[-1]) if latencies else 0.0,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'error_kinds': self.errors,
+            'per_path': self.paths,
+        }
+
+
+async def _timed_request(conn, path, started, window_start, stats):
+    try:
+        status, size = await conn.request(path)
+    except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+            asyncio.TimeoutError) as e:
+        if started >= window_start:
+            stats.error(type(e).__name__)
+        return
+    if started >= window_start:
+        stats.record(path, status, size, time.perf_counter() - started)
+
+
+async def run_closed_loop(host, port, paths, connections, duration, warmup=0.0,
+                          keep_alive=True, timeout=DEFAULT_TIMEOUT, seed=0):
+    """Each connection sends its next request when the previous one is answered."""
+    stats = LoadStats()
+    window_start = time.perf_counter() + warmup
+    deadline = window_start + duration
+    rng = random.Random(seed)
+
+    async def client():
+        conn = HTTPConnection(host, port, keep_alive, timeout)
+        try:
+            while (started := time.perf_counter()) < deadline:
+                await _timed_request(conn, rng.choice(paths), started, window_start, stats)
+        finally:
+            await conn.close()
+
+    await asyncio.gather(*(client() for _ in range(connections)))
+    return stats, max(time.perf_counter(), deadline) - window_start
+
+
+async def run_fixed_rate(host, port, paths, connections, rate, duration, warmup=0.0,
+                         keep_alive=True, timeout=DEFAULT_TIMEOUT, seed=0):
+    """Start requests on a fixed schedule; latency counts from when each was due."""
+    stats = LoadStats()
+    pool = asyncio.Queue()
+    for _ in range(connections):
+        pool.put_nowait(HTTPConnection(host, port, keep_alive, timeout))
+    rng = random.Random(seed)
+    begin = time.perf_counter()
+    window_start = begin + warmup
+    total = int((warmup + duration) * rate)
+
+    async def scheduled(path, due):
+        conn = await pool.get()
+        try:
+            await _timed_request(conn, path, due, window_start, stats)
+        finally:
+            pool.put_nowait(conn)
+
+    tasks = []
+    for i in range(total):
+        due = begin + i / rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(scheduled(rng.choice(paths), due)))
+    await asyncio.gather(*tasks)
+    while not pool.empty():
+        await pool.get_nowait().close()
+    return stats, time.perf_counter() - window_start
+
+
+def run_load(host, port, paths, mode='closed', connections=DEFAULT_CONNECTIONS, rate=DEFAULT_RATE,
+             duration=DEFAULT_DURATION, warmup=DEFAULT_WARMUP, keep_alive=True,
+             timeout=DEFAULT_TIMEOUT, seed=0):
+    """Run one load phase and return the results as a dict."""
+    if mode == 'closed':
+        stats, elapsed = asyncio.run(run_closed_loop(host, port, paths, connections, duration, warmup,
+                                                     keep_alive, timeout, seed))
+    else:
+        stats, elapsed = asyncio.run(run_fixed_rate(host, port, paths, connections, rate, duration, warmup,
+                                                    keep_alive, timeout, seed))
+    return {
+        'mode': mode,
+        'connections': connections,
+        'rate': rate if mode == 'fixed-rate' else None,
+        'keep_alive': keep_alive,
+        'duration_s': round(elapsed, 3),
+        'paths': paths,
+        **stats.summary(elapsed),
+    }
+
+
+def start_server(serve_args=(), timeout=10.0):
+    """Start serve.py on a free port; returns (process, port), or (process, None) if it failed.
+
+    The server reports its port over a pipe once it is listening (--ready-fd).
+    """
+    script = Path(__file__).parent / 'serve.py'
+    ready_read, ready_write = os.pipe()
+    try:
+        process = subprocess.Popen(
+            [sys.executable, str(script), '--port', '0', '--ready-fd', str(ready_write),
+             '--access-log', 'off', *serve_args],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            pass_fds=(ready_write,),
+        )
+    finally:
+        os.close(ready_write)
+    try:
+        readable, _, _ = select.select([ready_read], [], [], timeout)
+        line = os.read(ready_read, 64).decode('ascii', errors='replace') if readable else ''
+    finally:
+        os.close(ready_read)
+    port = int(line) if line.strip().isdigit() else None
+    return process, port
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def path_mix(paths):
+    """The requested paths with content hashes stripped, as a comparable set.
+
+    Fingerprinted bundles get a new name on every config edit, which does not
+    make the load any different.
+    """
+    return {FINGERPRINT.sub('', urllib.parse.urlsplit(path).path) for path in paths or ()}
+
+
+def compare_to_baseline(results, baseline):
+    """Return regressions as dicts of metric, baseline and current values.
+
+    Returns None when the baseline was recorded with different settings.
+    """
+    if any(results.get(key) != baseline.get(key) for key in COMPARABLE_SETTINGS):
+        return None
+    if path_mix(results.get('paths')) != path_mix(baseline.get('paths')):
+        return None
+    regressions = []
+    for metric, (worse, ratio, minimum) in REGRESSION_THRESHOLDS.items():
+        old, new = baseline.get(metric), results[metric]
+        if old is None:
+            continue
+        if worse == 'higher':
+            regressed = new > old * ratio and new - old >= minimum
+        else:
+            regressed = new < old * ratio and old - new >= minimum
+        if regressed:
+            regressions.append({'metric': metric, 'baseline': old, 'current': new})
+    return regressions
+
+
+def print_summary(results):
+    label = 'closed loop' if results['mode'] == 'closed' else f"fixed rate {results['rate']:g}/s"
+    connection = 'keep-alive' if results['keep_alive'] else 'new connection per request'
+    print(f"⏱️  {label}, {results['connections']} connections, {connection}, "
+          f"{len(results['paths'])} paths, {results['duration_s']:.1f}s measured")
+    print(f"📈 {results['requests']} requests, {results['rps']} req/s, "
+          f"{results['bytes_per_s'] / 1e6:.1f} MB/s")
+    print(f"📈 latency p50 {results['p50_ms']} ms, p95 {results['p95_ms']} ms, "
+          f"p99 {results['p99_ms']} ms, max {results['max_ms']} ms")
+    if results['errors']:
+        kinds = ', '.join(f'{kind} ×{count}' for kind, count in results['error_kinds'].items())
+        print(f"⚠️  {results['errors']} errors ({results['error_rate']:.2%}): {kinds}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Asyncio HTTP load generator for serve.py')
+    parser.add_argument('--url', help='Server to load (default: start serve.py for the run)')
+    parser.add_argument('--serve-mode', choices=MODES, default='threaded',
+                        help='Concurrency mode of the started server (default: threaded)')
+    parser.add_argument('--mode', choices=LOAD_MODES, default='closed', help='Load model (default: closed)')
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS,
+                        help=f'Concurrent connections (default: {DEFAULT_CONNECTIONS})')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f'Requests per second in fixed-rate mode (default: {DEFAULT_RATE:g})')
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION,
+                        help=f'Seconds of measured load (default: {DEFAULT_DURATION:g})')
+    parser.add_argument('--warmup', type=float, default=DEFAULT_WARMUP,
+                        help=f'Seconds of unmeasured load first (default: {DEFAULT_WARMUP:g})')
+    parser.add_argument('--no-keep-alive', action='store_true', help='New connection for every request')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Request timeout in seconds (default: {DEFAULT_TIMEOUT:g})')
+    parser.add_argument('--paths', nargs='+', help='URL paths to request (default: discovered mix)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the URL mix (default: 0)')
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--json', action='store_true', help='Print the JSON results')
+    parser.add_argument('--baseline', help='Compare with results saved earlier')
+    parser.add_argument('--save-baseline', help='Copy the results to this path')
+    parser.add_argument('--max-error-rate', type=float, default=0.01,
+                        help='Fraction of failed requests tolerated (default: 0.01)')
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+    paths = args.paths or discover_paths(project_root)
+    keep_alive = not args.no_keep_alive
+
+    server = None
+    if args.url:
+        target = urllib.parse.urlsplit(args.url)
+        host, port = target.hostname or 'localhost', target.port or 80
+    else:
+        serve_args = ['--mode', args.serve_mode] + (['--keep-alive'] if keep_alive else [])
+        server, port = start_server(serve_args)
+        host = '127.0.0.1'
+        if port is None:
+            stop_server(server)
+            print("❌ serve.py did not start")
+            return 1
+
+    try:
+        if not args.json:
+            print(f"🚀 Loading http://{host}:{port} for {args.warmup:g}s warm-up + {args.duration:g}s")
+        results = run_load(host, port, paths, args.mode, args.connections, args.rate, args.duration,
+                           args.warmup, keep_alive, args.timeout, args.seed)
+    finally:
+        if server is not None:
+            stop_server(server)
+    results['target'] = f'http://{host}:{port}' if args.url else f'serve.py --mode {args.serve_mode}'
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+                f.write('\n')
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_summary(results)
+
+    failed = False
+    if results['requests'] == 0 or results['error_rate'] > args.max_error_rate:
+        print(f"❌ Error rate {results['error_rate']:.2%} is above {args.max_error_rate:.2%}")
+        failed = True
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read baseline {args.baseline}: {e}")
+            return 1
+        regressions = compare_to_baseline(results, baseline)
+        if regressions is None:
+            print(f"⚠️  {args.baseline} was recorded with different settings; not compared")
+        elif regressions:
+            for regression in regressions:
+                print(f"❌ {regression['metric']} {regression['baseline']} → {regression['current']} "
+                      f"(baseline {args.baseline})")
+            failed = True
+        else:
+            print(f"✅ No regressions against {args.baseline}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
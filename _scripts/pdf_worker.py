@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Persistent headless Chrome for HTML to PDF conversion.
+Starts one Chrome process and talks to it over the DevTools protocol on a
+pipe (--remote-debugging-pipe: commands go in on fd 3, replies come back on
+fd 4, each message NUL-terminated JSON), so any number of documents can be
+printed with Page.printToPDF without paying browser startup per document.
+
+Usage:
+    python3 _scripts/pdf_worker.py resume.html [other.html ...] [--out-dir assets]
+
+Options:
+    --out-dir    Directory for the PDFs, named after each input (default: next to the input)
+    --timeout    Seconds to wait for each page load or print (default: 30)
+
+From Python:
+    with ChromeWorker() as chrome:
+        chrome.print_batch([(html_path, pdf_path), ...])
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import base64
+import select
+import shutil
+import argparse
+import functools
+import subprocess
+from pathlib import Path
+
+# Tried in order; absolute paths are checked directly, bare names on PATH
+CHROME_CANDIDATES = (
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',  # macOS
+    '/usr/bin/google-chrome',  # Linux
+    '/usr/bin/chromium-browser',  # Linux alternative
+    'google-chrome',  # PATH
+    'chromium',  # PATH alternative
+)
+CHROME_ARGS = ['--headless', '--disable-gpu', '--no-sandbox', '--remote-debugging-pipe',
+               '--no-first-run', '--no-default-browser-check']
+# Same output as the old --print-to-pdf-no-header --no-margins command line
+PDF_OPTIONS = {
+    'displayHeaderFooter': False,
+    'marginTop': 0, 'marginBottom': 0, 'marginLeft': 0, 'marginRight': 0,
+}
+DEFAULT_TIMEOUT = 30.0
+
+
+class ChromeError(Exception):
+    """Chrome could not be started or a DevTools command failed."""
+
+
+@functools.lru_cache(maxsize=None)
+def find_chrome():
+    """Return the first usable Chrome/Chromium executable, or None. Cached per process."""
+    for candidate in CHROME_CANDIDATES:
+        if os.path.isabs(candidate):
+            if os.access(candidate, os.X_OK):
+                return candidate
+        else:
+            found = shutil.which(candidate)
+            if found:
+                return found
+    return None
+
+
+def _high_fd(fd):
+    """Duplicate fd above 4 so dup2 onto 3/4 in the child cannot clobber it."""
+    high = fcntl.fcntl(fd, fcntl.F_DUPFD_CLOEXEC, 5)
+    os.close(fd)
+    return high
+
+
+class ChromeWorker:
+    """One headless Chrome process reused for every printToPDF call."""
+
+    def __init__(self, chrome_path=None, timeout=DEFAULT_TIMEOUT):
+        self.chrome_path = chrome_path or find_chrome()
+        if self.chrome_path is None:
+            raise ChromeError('Chrome/Chromium not found')
+        self.timeout = timeout
+        self.process = None
+        self.session_id = None
+        self._next_id = 0
+        self._buffer = bytearray()
+        self._events = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start(self):
+        """Launch Chrome and open the tab that every document is printed from."""
+        cmd_read, cmd_write = (_high_fd(fd) for fd in os.pipe())
+        reply_read, reply_write = (_high_fd(fd) for fd in os.pipe())
+
+        def attach_pipes():
+            os.dup2(cmd_read, 3)
+            os.dup2(reply_write, 4)
+
+        try:
+            self.process = subprocess.Popen(
+                [self.chrome_path, *CHROME_ARGS, 'about:blank'],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                pass_fds=(3, 4),
+                preexec_fn=attach_pipes,
+            )
+        except OSError as e:
+            for fd in (cmd_read, cmd_write, reply_read, reply_write):
+                os.close(fd)
+            raise ChromeError(f'could not start {self.chrome_path}: {e}') from e
+        os.close(cmd_read)
+        os.close(reply_write)
+        self._write_fd = cmd_write
+        self._read_fd = reply_read
+
+        try:
+            target_id = self.send('Target.createTarget', {'url': 'about:blank'})['targetId']
+            self.session_id = self.send('Target.attachToTarget',
+                                        {'targetId': target_id, 'flatten': True})['sessionId']
+            self.send('Page.enable', session=True)
+        except ChromeError:
+            self.close()
+            raise
+
+    def close(self):
+        """Ask Chrome to exit, killing it if it does not."""
+        if self.process is None:
+            return
+        try:
+            self.send('Browser.close', timeout=5)
+        except ChromeError:
+            pass
+        for fd in (self._write_fd, self._read_fd):
+            os.close(fd)
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+    def send(self, method, params=None, session=False, timeout=None):
+        """Issue one DevTools command and return its result."""
+        self._next_id += 1
+        message = {'id': self._next_id, 'method': method, 'params': params or {}}
+        if session:
+            message['sessionId'] = self.session_id
+        try:
+            os.write(self._write_fd, json.dumps(message).encode('utf-8') + b'\0')
+        except OSError as e:
+            raise ChromeError(f'{method}: browser pipe closed ({e})') from e
+
+        deadline = time.monotonic() + (timeout or self.timeout)
+        while True:
+            reply = self._read_message(deadline, method)
+            if reply.get('id') != message['id']:
+                self._events.append(reply)
+                continue
+            if 'error' in reply:
+                raise ChromeError(f"{method}: {reply['error'].get('message', reply['error'])}")
+            return reply.get('result', {})
+
+    def wait_for_event(self, method, timeout=None):
+        """Wait for an event from our tab, including ones that arrived during a command."""
+        for i, event in enumerate(self._events):
+            if event.get('method') == method and event.get('sessionId') == self.session_id:
+                return self._events.pop(i)
+        deadline = time.monotonic() + (timeout or self.timeout)
+        while True:
+            event = self._read_message(deadline, method)
+            if event.get('method') == method and event.get('sessionId') == self.session_id:
+                return event
+
+    def _read_message(self, deadline, waiting_for):
+        # PDFs come back base64-encoded in one message, so scan only the new bytes
+        scanned = 0
+        while (end := self._buffer.find(b'\0', scanned)) < 0:
+            scanned = len(self._buffer)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ChromeError(f'{waiting_for}: timed out')
+            ready, _, _ = select.select([self._read_fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(self._read_fd, 1 << 16)
+            if not chunk:
+                raise ChromeError(f'{waiting_for}: browser exited')
+            self._buffer += chunk
+        raw = bytes(self._buffer[:end])
+        del self._buffer[:end + 1]
+        return json.loads(raw)
+
+    def print_to_pdf(self, html_path, pdf_path, options=None):
+        """Load one HTML file in the warm tab and write it out as a PDF."""
+        self._events.clear()
+        result = self.send('Page.navigate', {'url': Path(html_path).resolve().as_uri()}, session=True)
+        if result.get('errorText'):
+            raise ChromeError(f"{html_path}: {result['errorText']}")
+        self.wait_for_event('Page.loadEventFired')
+        pdf = self.send('Page.printToPDF', {**PDF_OPTIONS, **(options or {})}, session=True)
+
+        os.makedirs(os.path.dirname(os.path.abspath(pdf_path)), exist_ok=True)
+        tmp_path = f'{pdf_path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(base64.b64decode(pdf['data']))
+        os.replace(tmp_path, pdf_path)
+        return pdf_path
+
+    def print_batch(self, jobs, options=None):
+        """Print (html_path, pdf_path) pairs in order; returns one error string or None per job."""
+        errors = []
+        for html_path, pdf_path in jobs:
+            try:
+                self.print_to_pdf(html_path, pdf_path, options)
+                errors.append(None)
+            except ChromeError as e:
+                if self.process.poll() is not None:
+                    raise
+                errors.append(str(e))
+        return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print HTML files to PDF with one headless Chrome')
+    parser.add_argument('inputs', nargs='+', help='HTML files to print')
+    parser.add_argument('--out-dir', help='Directory for the PDFs (default: next to each input)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Seconds per page load or print (default: {DEFAULT_TIMEOUT:g})')
+    args = parser.parse_args()
+
+    jobs = []
+    for html_path in args.inputs:
+        out_dir = args.out_dir or os.path.dirname(os.path.abspath(html_path))
+        jobs.append((html_path, os.path.join(out_dir, Path(html_path).stem + '.pdf')))
+
+    try:
+        with ChromeWorker(timeout=args.timeout) as chrome:
+            started = time.perf_counter()
+            errors = chrome.print_batch(jobs)
+            elapsed = time.perf_counter() - started
+    except ChromeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    for (html_path, pdf_path), error in zip(jobs, errors):
+        print(f"❌ {html_path}: {error}" if error else f"✅ {html_path} -> {pdf_path}")
+    print(f"ℹ️  Printed {errors.count(None)}/{len(jobs)} document(s) in {elapsed:.2f}s")
+    return 0 if not any(errors) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Lighthouse and pa11y Trend Store
+================================
+Keeps the numbers from every Lighthouse and pa11y run in an append-only
+SQLite database (.perf-history.sqlite), keyed by commit and time, so a
+slow drift in LCP or a new accessibility error shows up against history
+instead of only against the fixed pass/fail thresholds.
+
+ingest reads the Lighthouse JSON reports in test-reports/lighthouse and
+test-reports/pa11y/pa11y-report.json. A report is stored once, however
+often it is ingested (cached gates restore the same files).
+
+report groups runs by commit, takes the median of each commit's runs, and
+compares the latest commit with the rolling median of the commits before
+it. A change is flagged when it is in the worse direction and its robust
+z-score (distance from the median in units of the median absolute
+deviation) is above --threshold, or, when history has no spread, when it
+exceeds the metric's own tolerance.
+
+Usage:
+    python3 _scripts/perf_history.py ingest [--commit SHA]
+    python3 _scripts/perf_history.py report [--window 20] [--threshold 3.5] [--fail]
+    python3 _scripts/perf_history.py history lcp_ms [--url URL] [--window 5]
+
+Options:
+    --db            SQLite file (default: .perf-history.sqlite)
+    --commit        Commit to file runs under (default: GITHUB_SHA or git HEAD)
+    --window        Earlier commits in the rolling median (default: 20)
+    --threshold     Robust z-score above which a change is a regression (default: 3.5)
+    --min-history   Earlier commits needed before a metric is judged (default: 5)
+    --fail          Exit 1 when there are regressions
+"""
+
+import os
+import sys
+import json
+import glob
+import sqlite3
+import hashlib
+import argparse
+import statistics
+import subprocess
+from datetime import datetime
+
+DB_PATH = '.perf-history.sqlite'
+LIGHTHOUSE_DIR = os.path.join('test-reports', 'lighthouse')
+PA11Y_REPORT = os.path.join('test-reports', 'pa11y', 'pa11y-report.json')
+
+# metric -> (Lighthouse audit, whether higher is worse, tolerance when history has no spread)
+LIGHTHOUSE_AUDITS = {
+    'lcp_ms': ('largest-contentful-paint', True, 100.0),
+    'tbt_ms': ('total-blocking-time', True, 50.0),
+    'cls': ('cumulative-layout-shift', True, 0.01),
+    'fcp_ms': ('first-contentful-paint', True, 100.0),
+    'si_ms': ('speed-index', True, 100.0),
+}
+LIGHTHOUSE_CATEGORIES = {
+    'performance_score': 'performance',
+    'accessibility_score': 'accessibility',
+    'best_practices_score': 'best-practices',
+    'seo_score': 'seo',
+}
+HIGHER_IS_WORSE = {name: worse for name, (_, worse, _) in LIGHTHOUSE_AUDITS.items()}
+HIGHER_IS_WORSE.update({name: False for name in LIGHTHOUSE_CATEGORIES})
+HIGHER_IS_WORSE['pa11y_issues'] = True
+TOLERANCE = {name: tolerance for name, (_, _, tolerance) in LIGHTHOUSE_AUDITS.items()}
+TOLERANCE.update({name: 0.02 for name in LIGHTHOUSE_CATEGORIES})
+TOLERANCE['pa11y_issues'] = 0.0
+# Scales the MAD so the z-score matches a standard deviation for normal data
+MAD_SCALE = 0.6745
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    commit_sha TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    digest TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS runs_by_commit ON runs(commit_sha, recorded_at);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs(recorded_at);
+CREATE INDEX IF NOT EXISTS metrics_by_name ON metrics(name);
+"""
+
+
+def connect(path):
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    return db
+
+
+def current_commit():
+    """GITHUB_SHA in CI, otherwise HEAD, with -dirty for uncommitted changes."""
+    if os.environ.get('GITHUB_SHA'):
+        return os.environ['GITHUB_SHA'][:12]
+    try:
+        sha = subprocess.run(['git', 'rev-parse', '--short=12', 'HEAD'],
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{sha}-dirty' if dirty else sha
+
+
+def parse_timestamp(value):
+    """Lighthouse fetchTime (ISO 8601, UTC) to epoch seconds."""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
+def lighthouse_runs(report_dir):
+    """Yield (url, recorded_at, metrics, digest) for each Lighthouse JSON report."""
+    for path in sorted(glob.glob(os.path.join(report_dir, '*.json'))):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        try:
+            report = json.loads(raw)
+        except ValueError:
+            continue
+        if not isinstance(report, dict) or 'audits' not in report or 'categories' not in report:
+            continue  # manifest.json, assertion results
+        values = {}
+        for name, (audit, _, _) in LIGHTHOUSE_AUDITS.items():
+            value = report['audits'].get(audit, {}).get('numericValue')
+            if value is not None:
+                values[name] = float(value)
+        for name, category in LIGHTHOUSE_CATEGORIES.items():
+            score = report['categories'].get(category, {}).get('score')
+            if score is not None:
+                values[name] = float(score)
+        url = report.get('finalDisplayedUrl') or report.get('finalUrl') or report.get('requestedUrl', '')
+        recorded_at = parse_timestamp(report.get('fetchTime')) or os.path.getmtime(path)
+        yield url, recorded_at, values, hashlib.sha256(raw).hexdigest()
+
+
+def pa11y_runs(report_path):
+    """Yield (url, recorded_at, metrics, digest) for each URL in a pa11y-ci JSON report."""
+    try:
+        with open(report_path, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return
+    # run_tests.py sends stderr to the same file, so skip anything before the JSON
+    text = raw.decode('utf-8', errors='replace')
+    start = text.find('{')
+    try:
+        report = json.JSONDecoder().raw_decode(text[start:])[0] if start >= 0 else None
+    except ValueError:
+        return
+    if not isinstance(report, dict):
+        return
+    recorded_at = os.path.getmtime(report_path)
+    for url, issues in report.get('results', {}).items():
+        # A URL that failed to load has a single error object instead of issues
+        count = len(issues) if isinstance(issues, list) else 1
+        # Clean runs produce identical reports; the mtime tells them apart
+        # (and survives the gate cache's copy, so restored reports still dedupe)
+        digest = hashlib.sha256(raw + f'{url}\0{recorded_at}'.encode('utf-8')).hexdigest()
+        yield url, recorded_at, {'pa11y_issues': float(count)}, digest
+
+
+def ingest(db, commit, lighthouse_dir=LIGHTHOUSE_DIR, pa11y_report=PA11Y_REPORT):
+    """Store every report not seen before; returns the number of new runs."""
+    added = 0
+    sources = (('lighthouse', lighthouse_runs(lighthouse_dir)), ('pa11y', pa11y_runs(pa11y_report)))
+    with db:
+        for source, runs in sources:
+            for url, recorded_at, values, digest in runs:
+                if not values:
+                    continue
+                cursor = db.execute(
+                    'INSERT OR IGNORE INTO runs (source, url, commit_sha, recorded_at, digest) '
+                    'VALUES (?, ?, ?, ?, ?)', (source, url, commit, recorded_at, digest))
+                if cursor.rowcount == 0:
+                    continue
+                db.executemany('INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)',
+                               [(cursor.lastrowid, name, value) for name, value in values.items()])
+                added += 1
+    return added
+
+
+def commit_medians(db, name, url=None):
+    """Per (url, commit) median of one metric, oldest commit first.
+
+    Returns {url: [(commit, first recorded_at, median, runs), ...]}.
+    """
+    query = ('SELECT r.url, r.commit_sha, r.recorded_at, m.value FROM metrics m '
+             'JOIN runs r ON r.id = m.run_id WHERE m.name = ?')
+    params = [name]
+    if url:
+        query += ' AND r.url = ?'
+        params.append(url)
+    groups = {}
+    for run_url, commit, recorded_at, value in db.execute(query + ' ORDER BY r.recorded_at', params):
+        group = groups.setdefault(run_url, {}).setdefault(commit, [recorded_at, []])
+        group[1].append(value)
+    return {
+        run_url: [(commit, first, statistics.median(values), len(values))
+                  for commit, (first, values) in commits.items()]
+        for run_url, commits in groups.items()
+    }
+
+
+def robust_z(value, history):
+    """Distance of value from the median of history in (scaled) MAD units; None if MAD is 0."""
+    center = statistics.median(history)
+    mad = statistics.median(abs(x - center) for x in history)
+    if mad == 0:
+        return center, None
+    return center, MAD_SCALE * (value - center) / mad
+
+
+def find_regressions(db, window=20, threshold=3.5, min_history=5):
+    """Compare each metric's latest commit with the rolling median of the ones before it.
+
+    Returns (rows, regressions); rows cover every metric with enough history.
+    """
+    names = [row[0] for row in db.execute('SELECT DISTINCT name FROM metrics ORDER BY name')]
+    rows, regressions = [], []
+    for name in names:
+        for url, series in commit_medians(db, name).items():
+            if len(series) <= min_history:
+                continue
+            commit, _, latest, runs = series[-1]
+            history = [median for _, _, median, _ in series[-window - 1:-1]]
+            center, z = robust_z(latest, history)
+            worse = latest > center if HIGHER_IS_WORSE.get(name, True) else latest < center
+            if z is None:
+                regressed = worse and abs(latest - center) > TOLERANCE.get(name, 0.0)
+            else:
+                regressed = worse and abs(z) > threshold
+            row = {'metric': name, 'url': url, 'commit': commit, 'runs': runs, 'latest': latest,
+                   'rolling_median': center, 'z': z, 'history': len(history), 'regressed': regressed}
+            rows.append(row)
+            if regressed:
+                regressions.append(row)
+    return rows, regressions
+
+
+def format_value(name, value):
+    if name.endswith('_ms'):
+        return f'{value:.0f} ms'
+    if name.endswith('_score'):
+        return f'{value * 100:.0f}'
+    if name == 'cls':
+        return f'{value:.3f}'
+    return f'{value:g}'
+
+
+def rolling_history(series, window):
+    """(commit, median, rolling median of the last window commits) for a series."""
+    medians = [median for _, _, median, _ in series]
+    return [(commit, median, statistics.median(medians[max(0, i - window + 1):i + 1]))
+            for i, (commit, _, median, _) in enumerate(series)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Store Lighthouse/pa11y results and flag regressions')
+    parser.add_argument('--db', default=DB_PATH, help=f'SQLite file (default: {DB_PATH})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = commands.add_parser('ingest', help='Store the reports from the last test run')
+    ingest_parser.add_argument('--commit', help='Commit to file the runs under (default: current)')
+    ingest_parser.add_argument('--lighthouse-dir', default=LIGHTHOUSE_DIR)
+    ingest_parser.add_argument('--pa11y-report', default=PA11Y_REPORT)
+
+    report_parser = commands.add_parser('report', help='Compare the latest commit with history')
+    report_parser.add_argument('--window', type=int, default=20, help='Earlier commits to compare with')
+    report_parser.add_argument('--threshold', type=float, default=3.5, help='Robust z-score threshold')
+    report_parser.add_argument('--min-history', type=int, default=5, help='Earlier commits needed')
+    report_parser.add_argument('--fail', action='store_true', help='Exit 1 on regressions')
+
+    history_parser = commands.add_parser('history', help='Per-commit medians of one metric')
+    history_parser.add_argument('metric', help='e.g. lcp_ms, tbt_ms, cls, performance_score, pa11y_issues')
+    history_parser.add_argument('--url', help='Only this URL')
+    history_parser.add_argument('--window', type=int, default=5, help='Commits in the rolling median')
+
+    args = parser.parse_args()
+
+    # Paths given on the command line are relative to where it was typed,
+    # the defaults to the project root
+    for name in ('db', 'lighthouse_dir', 'pa11y_report'):
+        if getattr(args, name, None) and getattr(args, name) != parser.get_default(name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(os.path.dirname(script_dir))
+    db = connect(args.db)
+
+    if args.command == 'ingest':
+        commit = args.commit or current_commit()
+        added = ingest(db, commit, args.lighthouse_dir, args.pa11y_report)
+        total = db.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+        print(f"✅ Stored {added} new run(s) for {commit} ({total} in {args.db})")
+        return 0
+
+    if args.command == 'history':
+        series = commit_medians(db, args.metric, args.url)
+        if not series:
+            print(f"ℹ️  No runs recorded for {args.metric}")
+            return 0
+        for url, points in series.items():
+            print(f"📈 {args.metric} for {url}")
+            for commit, median, rolling in rolling_history(points, args.window):
+                print(f"  {commit:<20} {format_value(args.metric, median):>10}   "
+                      f"rolling {format_value(args.metric, rolling):>10}")
+        return 0
+
+    rows, regressions = find_regressions(db, args.window, args.threshold, args.min_history)
+    if not rows:
+        print(f"ℹ️  Not enough history yet: each metric needs more than {args.min_history} commits")
+        return 0
+    for row in rows:
+        marker = '❌' if row['regressed'] else '✅'
+        z = f"z={row['z']:+.1f}" if row['z'] is not None else 'no spread'
+        print(f"{marker} {row['metric']:<22} {format_value(row['metric'], row['latest']):>10} "
+              f"vs {format_value(row['metric'], row['rolling_median']):>10} over {row['history']} commits "
+              f"({z}) {row['url']}")
+    if regressions:
+        print(f"⚠️  {len(regressions)} regression(s) in {regressions[0]['commit']}")
+        return 1 if args.fail else 0
+    print("✅ No regressions against history")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Find and stop the processes listening on a TCP port.
+On Linux the listening sockets come from /proc/net/tcp and /proc/net/tcp6
+and their owners from the socket links in /proc/<pid>/fd, all in-process,
+so no lsof, ps or netstat is needed. Elsewhere (macOS) lsof is used.
+Only listeners are returned; clients connected to the port are left alone.
+Used by stop.py and run_tests.py.
+"""
+
+import os
+import time
+import signal
+import subprocess
+
+PROC_TCP_TABLES = ('/proc/net/tcp', '/proc/net/tcp6')
+TCP_LISTEN = '0A'
+
+
+def _listening_inodes(port):
+    """Socket inodes of every listener on port, or None without /proc/net."""
+    if not os.path.exists(PROC_TCP_TABLES[0]):
+        return None
+    inodes = set()
+    for table in PROC_TCP_TABLES:
+        try:
+            with open(table, 'r') as f:
+                next(f)  # header
+                for line in f:
+                    fields = line.split()
+                    # sl local_address rem_address st tx:rx tr:when retrnsmt uid timeout inode
+                    if fields[3] == TCP_LISTEN and int(fields[1].rsplit(':', 1)[1], 16) == port:
+                        inodes.add(fields[9])
+        except OSError:
+            continue  # no IPv6
+    return inodes
+
+
+def _socket_owners(inodes):
+    """PIDs holding any of the given socket inodes open."""
+    targets = {f'socket:[{inode}]' for inode in inodes}
+    pids = set()
+    for entry in os.scandir('/proc'):
+        if not entry.name.isdigit():
+            continue
+        fd_dir = f'/proc/{entry.name}/fd'
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue  # exited, or another user's process
+        for fd in fds:
+            try:
+                if os.readlink(f'{fd_dir}/{fd}') in targets:
+                    pids.add(int(entry.name))
+                    break
+            except OSError:
+                continue
+    return pids
+
+
+def _lsof_listeners(port):
+    try:
+        result = subprocess.run(['lsof', '-t', f'-iTCP:{port}', '-sTCP:LISTEN'],
+                                capture_output=True, text=True)
+    except FileNotFoundError:
+        return set()
+    return {int(pid) for pid in result.stdout.split() if pid.isdigit()}
+
+
+def port_listeners(port):
+    """Sorted PIDs of the processes listening on the TCP port."""
+    inodes = _listening_inodes(port)
+    if inodes is None:
+        return sorted(_lsof_listeners(port))
+    return sorted(_socket_owners(inodes)) if inodes else []
+
+
+def process_name(pid):
+    try:
+        with open(f'/proc/{pid}/comm', 'r') as f:
+            return f.read().strip()
+    except OSError:
+        pass
+    try:
+        result = subprocess.run(['ps', '-p', str(pid), '-o', 'comm='], capture_output=True, text=True)
+        return result.stdout.strip() or 'unknown'
+    except FileNotFoundError:
+        return 'unknown'
+
+
+def _is_running(pid):
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            # A zombie has exited; it only waits for its parent to reap it
+            return f.read().rsplit(')', 1)[1].split()[0] != 'Z'
+    except FileNotFoundError:
+        return False
+    except OSError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _wait_gone(pids, deadline):
+    alive = set(pids)
+    while alive and time.monotonic() < deadline:
+        alive = {pid for pid in alive if _is_running(pid)}
+        if alive:
+            time.sleep(0.05)
+    return {pid for pid in alive if _is_running(pid)}
+
+
+def terminate(pids, timeout=5.0):
+    """SIGTERM the processes, SIGKILL whatever is left after timeout seconds.
+
+    Returns {pid: outcome}, outcome being 'terminated', 'killed', 'gone'
+    (already exited) or 'denied'.
+    """
+    outcomes = {}
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+            outcomes[pid] = 'terminated'
+        except ProcessLookupError:
+            outcomes[pid] = 'gone'
+        except PermissionError:
+            outcomes[pid] = 'denied'
+
+    signalled = [pid for pid, outcome in outcomes.items() if outcome == 'terminated']
+    for pid in _wait_gone(signalled, time.monotonic() + timeout):
+        try:
+            os.kill(pid, signal.SIGKILL)
+            outcomes[pid] = 'killed'
+        except ProcessLookupError:
+            pass
+    _wait_gone(signalled, time.monotonic() + 1.0)
+    return outcomes
+
+
+def free_port(port, timeout=5.0):
+    """Stop every listener on the port; returns terminate()'s outcomes."""
+    return terminate(port_listeners(port), timeout)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Prerender the config-driven sections of index.html.
+Writes the hero text, keyword tags, project cards, experience cards and
+contact links from site.config.json as static HTML between marker comments:
+
+    <!-- prerender:projects 3f9a0c1b2d4e -->
+    ...generated markup...
+    <!-- /prerender:projects -->
+
+An "image" section wraps one <img> or image preload <link>; it is rewritten
+into a <picture> with AVIF/WebP sources and srcset/sizes (or imagesrcset)
+from the variants in assets/images/derived/manifest.json (build_images.py).
+
+The hex key on each start marker is a hash of the config, the image
+manifest and this script; when every marker already carries the current
+key nothing is rewritten.
+
+js/app.js sees the prerendered cards and only hydrates (buttons, links)
+instead of fetching the rest bundle and building the DOM itself.
+
+Usage:
+    python3 _scripts/prerender.py [--check] [--force]
+
+Options:
+    --check    Exit 1 if index.html is out of date, without writing
+    --force    Rewrite the sections even when the key matches
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from html import escape
+
+from site_config import CONFIG_PATH, ConfigError, load_site_config
+from build_images import MANIFEST_PATH as IMAGE_MANIFEST_PATH
+
+MARKER_PATTERN = re.compile(r'<!-- prerender:(\w+)(?: ([0-9a-f]+))? -->(.*?)<!-- /prerender:\1 -->', re.S)
+GITHUB_ICON = ('<svg width="32" height="32" fill="currentColor" viewBox="0 0 16 16" aria-hidden="true">'
+               '<path d="M8 0C3.58 0 0 3.58 0 8c0 3.54 2.29 6.53 5.47 7.59.4.07.55-.17.55-.38 0-.19-.01-.82-.01-1.49'
+               '-2.01.37-2.53-.49-2.69-.94-.09-.23-.48-.94-.82-1.13-.28-.15-.68-.52-.01-.53.63-.01 1.08.58 1.23.82.72 '
+               '1.21 1.87.87 2.33.66.07-.52.28-.87.51-1.07-1.78-.2-3.64-.89-3.64-3.95 0-.87.31-1.59.82-2.15-.08-.2-.36-'
+               '1.02.08-2.12 0 0 .67-.21 2.2.82.64-.18 1.32-.27 2-.27.68 0 1.36.09 2 .27 1.53-1.04 2.2-.82 2.2-.82.44 1.1'
+               '.16 1.92.08 2.12.51.56.82 1.27.82 2.15 0 3.07-1.87 3.75-3.65 3.95.29.25.54.73.54 1.48 0 1.07-.01 1.93-.01 '
+               '2.2 0 .21.15.46.55.38A8.012 8.012 0 0 0 16 8c0-4.42-3.58-8-8-8z"/></svg>')
+EXTERNAL = 'target="_blank" rel="noopener noreferrer"'
+ELEMENT_PATTERN = re.compile(r'<(img|link)\b([^>]*?)\s*/?>')
+ATTRIBUTE_PATTERN = re.compile(r'([\w:-]+)(?:="([^"]*)")?')
+# Preferred first; the original format stays on the <img> itself
+MODERN_TYPES = ('image/avif', 'image/webp')
+
+
+def render_summary(cfg):
+    if isinstance(cfg['summary'], list):
+        return '<ul>' + ''.join(f'<li>{escape(item)}</li>' for item in cfg['summary']) + '</ul>'
+    return escape(cfg['summary'])
+
+
+def render_tags(cfg):
+    return [f'<a href="{escape(cfg["keywordLinks"].get(k, "#"))}" {EXTERNAL} class="tag">{escape(k)}</a>'
+            for k in cfg['keywords']]
+
+
+def render_projects(cfg):
+    cards = []
+    for p in cfg['projects']:
+        badges = ''.join(f'<span class="badge">{escape(s)}</span>' for s in p['stack'])
+        demo = (f'<a href="{escape(p["links"]["demo"])}" {EXTERNAL} class="demo-link">Demo</a>'
+                if p['links'].get('demo') else '')
+        cards.append(
+            f'<article class="card"><h3>{escape(p["title"])}</h3><p>{escape(p["description"])}</p>'
+            f'<div class="badges">{badges}</div><div class="card-footer">{demo}'
+            f'<a href="{escape(p["links"]["repo"])}" {EXTERNAL} class="github-icon" '
+            f'aria-label="View {escape(p["title"])} source code on GitHub">{GITHUB_ICON}</a></div></article>')
+    return cards
+
+
+def render_experience(cfg):
+    cards = []
+    for e in cfg['experience']:
+        highlights = ''.join(f'<li>{escape(h)}</li>' for h in e['highlights'])
+        cards.append(f'<article class="card"><h3>{escape(e["company"])} — {escape(e["title"])}</h3>'
+                     f'<p class="period">{escape(e["period"])}</p><ul>{highlights}</ul></article>')
+    return cards
+
+
+def render_contact(cfg):
+    return ''.join(f'<a href="{escape(url)}" {EXTERNAL}>{escape(key[0].upper() + key[1:])}</a> · '
+                   for key, url in cfg['links'].items() if url)
+
+
+# Inline sections render to one string, block sections to one line per item
+SECTIONS = {
+    'name': lambda cfg: escape(cfg['name']),
+    'role': lambda cfg: escape(cfg['role']),
+    'summary': render_summary,
+    'tags': render_tags,
+    'projects': render_projects,
+    'experience': render_experience,
+    'contact': render_contact,
+}
+
+
+def srcset(variants):
+    return ', '.join(f'./{variant["path"]} {variant["width"]}w' for variant in variants)
+
+
+def render_image(current, images):
+    """Rebuild the <img> or preload <link> inside an image section from the manifest."""
+    element = ELEMENT_PATTERN.search(current)
+    if element is None:
+        raise ValueError('image section without an <img> or <link>')
+    tag = element.group(1)
+    attrs = {name: value for name, value in ATTRIBUTE_PATTERN.findall(element.group(2))}
+    for generated in ('srcset', 'imagesrcset', 'type'):
+        attrs.pop(generated, None)
+
+    source = attrs.get('src' if tag == 'img' else 'href', '')
+    variants = images.get(os.path.basename(source), {}).get('variants', {})
+    fallback = next((v for mime, v in variants.items() if mime not in MODERN_TYPES), None)
+    modern = [(mime, variants[mime]) for mime in MODERN_TYPES if mime in variants]
+
+    if tag == 'link':
+        # Preload what the <picture> will pick first; browsers skip unsupported types
+        mime, chosen = modern[0] if modern else (None, fallback)
+        if chosen:
+            attrs['imagesrcset'] = srcset(chosen)
+            if mime:
+                attrs['type'] = mime
+
+    if tag == 'img' and fallback:
+        attrs['srcset'] = srcset(fallback)
+    markup = f'<{tag} ' + ' '.join(name if not value and name not in ('alt',) else f'{name}="{value}"'
+                                  for name, value in attrs.items()) + '>'
+    if tag == 'link' or not modern:
+        return markup
+
+    sizes = f' sizes="{attrs["sizes"]}"' if 'sizes' in attrs else ''
+    sources = ''.join(f'<source type="{mime}" srcset="{srcset(v)}"{sizes}>' for mime, v in modern)
+    return f'<picture>{sources}{markup}</picture>'
+
+
+def load_image_manifest(project_root):
+    try:
+        with open(os.path.join(project_root, IMAGE_MANIFEST_PATH), 'r') as f:
+            return json.load(f).get('images', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def prerender_key(cfg, images):
+    """Hash of the config, the image manifest and this script, recorded on every marker."""
+    digest = hashlib.sha256(json.dumps([cfg, images], sort_keys=True).encode('utf-8'))
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def prerender(text, cfg, key, images=None):
+    """Return text with every marked section regenerated under the given key."""
+    def replace(match):
+        name = match.group(1)
+        if name == 'image':
+            rendered = render_image(match.group(3), images or {})
+            return f'<!-- prerender:{name} {key} -->{rendered}<!-- /prerender:{name} -->'
+        if name not in SECTIONS:
+            raise ValueError(f'unknown prerender section "{name}"')
+        rendered = SECTIONS[name](cfg)
+        if isinstance(rendered, list):
+            line_start = text.rfind('\n', 0, match.start()) + 1
+            indent = text[line_start:match.start()]
+            if indent.strip():
+                indent = ''
+            rendered = ''.join(f'\n{indent}{line}' for line in rendered) + f'\n{indent}'
+        return f'<!-- prerender:{name} {key} -->{rendered}<!-- /prerender:{name} -->'
+
+    return MARKER_PATTERN.sub(replace, text)
+
+
+def prerender_index(project_root, check=False, force=False):
+    """Bring index.html up to date; returns True when it was (or, with check, would be) rewritten."""
+    cfg = load_site_config(project_root)
+    images = load_image_manifest(project_root)
+    key = prerender_key(cfg, images)
+    index_path = os.path.join(project_root, 'index.html')
+    with open(index_path, 'r') as f:
+        text = f.read()
+
+    markers = MARKER_PATTERN.findall(text)
+    if not markers:
+        raise ValueError('index.html has no prerender markers')
+    if not force and all(marker_key == key for _, marker_key, _ in markers):
+        return False
+    if check:
+        return True
+
+    updated = prerender(text, cfg, key, images)
+    tmp_path = f'{index_path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(updated)
+    os.replace(tmp_path, index_path)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prerender config-driven sections into index.html')
+    parser.add_argument('--check', action='store_true', help='Only report whether index.html is out of date')
+    parser.add_argument('--force', action='store_true', help='Rewrite even when the config is unchanged')
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+
+    try:
+        changed = prerender_index(project_root, check=args.check, force=args.force)
+    except ConfigError as e:
+        print(f"❌ {CONFIG_PATH} is invalid:")
+        for error in e.errors:
+            print(f"  • {error}")
+        return 1
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.check:
+        if changed:
+            print("❌ index.html is out of date; run python3 _scripts/prerender.py")
+            return 1
+        print("✅ Prerendered sections are up to date")
+    else:
+        print("✅ Prerendered index.html" if changed else "✅ Prerendered sections already up to date")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
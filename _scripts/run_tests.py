@@ -6,23 +6,68 @@ Local Testing Script
 Runs all quality gates locally, mirroring the CI/CD pipeline.
 This helps validate changes before pushing to GitHub.
 
+Gates are declared as a dependency graph and run concurrently: the link
+check starts right away, while pa11y and Lighthouse start as soon as the
+local server is up. Output lines are prefixed with the gate that wrote them.
+
+Link, accessibility and Lighthouse results are cached in .gate-cache/,
+keyed by a hash of each gate's input files and config file, taken when the
+gate is about to start (after the build gates wrote them). When nothing
+changed the stored verdict and reports are reused (link results expire after
+a day, since remote pages change on their own).
+
+Lighthouse and pa11y results are added to .perf-history.sqlite after each
+run and compared with earlier commits (see perf_history.py).
+
+Command output is streamed to the console and to test-reports/logs/<gate>.log
+as it arrives. Each gate declares a timeout for its commands; when it runs
+out, the command's whole process group is stopped. The local server writes
+its output to test-reports/logs/server.log and a JSON access log to
+test-reports/logs/access.log; its request counts and latency histograms
+(/__metrics) are saved to test-reports/metrics/server.prom before it stops.
+
+With --load-test the server is also put under load (load_gen.py) once the
+other gates are done; throughput and p50/p95/p99 latency go to
+test-reports/load/results.json and are compared with test/load-baseline.json.
+
+Every command's wall time, CPU time, peak RSS and exit status are logged to
+test-reports/metrics/commands.jsonl, with per-gate totals in summary.json
+(see gate_metrics.py).
+
 Usage:
-    python3 _scripts/run_tests.py [--skip-deps] [--port 8001]
+    python3 _scripts/run_tests.py [--skip-deps] [--port 8001] [--jobs 4]
     
 Options:
     --skip-deps    Skip dependency checks (assume all tools are installed)
-    --port         Port for local server (default: 8001 to avoid conflicts)
+    --port         Port for local server (default: 8001 to avoid conflicts;
+                   0 picks a free port, so several runs can share a machine)
+    --jobs         Gates to run at once (default: 4; use 1 for the old
+                   one-after-another order and quieter Lighthouse numbers)
+    --force        Ignore cached gate results and rerun everything
+    --baseline     summary.json from an earlier run; flag gates that got
+                   slower or use more memory than in it
+    --save-baseline
+                   Also write this run's summary.json to the given path
+    --load-test    Also run the server load test (load_gen.py) as a last gate
 """
 
 import os
 import sys
 import json
 import time
-import signal
+import select
+import hashlib
 import argparse
+import threading
 import subprocess
 import shutil
+import urllib.request
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from ports import port_listeners, process_name, terminate
+from gate_metrics import (METRICS_DIR, metrics, run_measured, stop_running_commands, format_usage,
+                          load_baseline, compare_to_baseline)
 
 # Colors for output
 class Colors:
@@ -53,39 +98,300 @@ def print_error(message):
     """Print error message."""
     print(f"{Colors.RED}❌ {message}{Colors.END}")
 
+class GateOutput:
+    """Stand-in for sys.stdout that prefixes each line with the gate printing it.
+
+    Gates run on worker threads; each thread sets its label, and whole lines
+    are written under a lock so concurrent gates never interleave mid-line.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def set_label(self, label):
+        self.local.label = label
+        self.local.pending = ''
+
+    def write(self, text):
+        label = getattr(self.local, 'label', None)
+        if label is None:
+            with self.lock:
+                return self.stream.write(text)
+        *lines, self.local.pending = (self.local.pending + text).split('\n')
+        with self.lock:
+            for line in lines:
+                self.stream.write(f"{Colors.BOLD}[{label}]{Colors.END} {line}\n")
+            self.stream.flush()
+        return len(text)
+
+    def line_writer(self):
+        """A function that prints whole lines under this thread's label from any thread."""
+        label = getattr(self.local, 'label', None)
+        prefix = f"{Colors.BOLD}[{label}]{Colors.END} " if label else ''
+
+        def write_line(line):
+            with self.lock:
+                self.stream.write(f"{prefix}{line}\n")
+                self.stream.flush()
+        return write_line
+
+    def flush(self):
+        with self.lock:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+GATE_CACHE_DIR = Path('.gate-cache')
+LOG_DIR = Path('test-reports') / 'logs'
+DEFAULT_GATE_TIMEOUT = 120
+LOAD_BASELINE = Path('test') / 'load-baseline.json'
+
+# Deadline and log file of the gate running on the current thread
+gate_context = threading.local()
+
+# Inputs shared by the gates that load the site in a browser
+SITE_INPUTS = ['index.html', 'css/*', 'js/*', 'assets/data/*', 'assets/images/*', '_scripts/serve.py']
+
+class Gate:
+    """A quality gate and its place in the dependency graph.
+
+    requires: gates that must pass first (this gate is skipped otherwise)
+    after:    gates that must finish first, whatever their result
+    lazy:     only run if a gate that requires it has to run
+    timeout:  seconds the gate's commands may take in total; the process
+              group of a command still running at the deadline is killed
+
+    Gates that declare inputs (glob patterns) and a config file have their
+    verdict and reports directory cached; tools are the commands they run,
+    which must be installed for a result to be cached. A cached gate does
+    not wait for lazy gates, so e.g. the server is not started for it.
+    """
+
+    def __init__(self, name, run, requires=(), after=(), lazy=False, timeout=DEFAULT_GATE_TIMEOUT,
+                 inputs=(), config=None, reports=None, tools=(), max_age=None):
+        self.name = name
+        self.run = run
+        self.requires = tuple(requires)
+        self.after = tuple(after)
+        self.lazy = lazy
+        self.timeout = timeout
+        self.inputs = tuple(inputs)
+        self.config = config
+        self.reports = reports
+        self.tools = tuple(tools)
+        self.max_age = max_age
+        self.cached = False
+        self.cache_checked = False
+
+    @property
+    def cacheable(self):
+        return bool(self.inputs and self.config)
+
+    @property
+    def slug(self):
+        return self.name.lower().replace(' ', '-')
+
+def gate_cache_key(gate):
+    """Hash the gate's config, input files and tool paths; None if a tool is missing."""
+    tool_paths = [shutil.which(tool) for tool in gate.tools]
+    if None in tool_paths:
+        return None
+    digest = hashlib.sha256()
+    digest.update(gate.name.encode())
+    for tool_path in tool_paths:
+        digest.update(tool_path.encode())
+    files = {gate.config}
+    for pattern in gate.inputs:
+        files.update(str(path) for path in Path('.').glob(pattern)
+                     if path.is_file() and path.suffix not in ('.gz', '.br'))
+    for path in sorted(files):
+        digest.update(path.encode() + b'\0')
+        try:
+            digest.update(Path(path).read_bytes())
+        except OSError:
+            digest.update(b'<missing>')
+    return digest.hexdigest()
+
+def load_cached_result(gate, key):
+    """Return the cached entry for this key, or None if absent or expired."""
+    try:
+        entry = json.loads((GATE_CACHE_DIR / f"{gate.slug}.json").read_text())
+    except (OSError, ValueError):
+        return None
+    if entry.get('key') != key:
+        return None
+    if gate.max_age is not None and time.time() - entry.get('created', 0) > gate.max_age:
+        return None
+    return entry
+
+def store_cached_result(gate, key, success):
+    """Record the verdict and a copy of the gate's reports."""
+    GATE_CACHE_DIR.mkdir(exist_ok=True)
+    if gate.reports and os.path.isdir(gate.reports):
+        saved = GATE_CACHE_DIR / gate.slug
+        shutil.rmtree(saved, ignore_errors=True)
+        shutil.copytree(gate.reports, saved)
+    entry = {'gate': gate.name, 'key': key, 'success': success, 'created': time.time()}
+    (GATE_CACHE_DIR / f"{gate.slug}.json").write_text(json.dumps(entry, indent=2))
+
+def check_gate_cache(gate, force=False):
+    """Swap in the cached verdict if the gate's inputs are unchanged.
+
+    Called when the gate is about to start, after the gates it waits for
+    have written their outputs, so the key covers the files the gate will
+    actually see. A hit replaces the gate's run with one that restores the
+    stored reports; a miss wraps the run so its verdict is stored under
+    this key afterwards.
+    """
+    gate.cache_checked = True
+    if not gate.cacheable:
+        return
+    key = gate_cache_key(gate)
+    if key is None:
+        return
+    entry = None if force else load_cached_result(gate, key)
+    if entry is not None:
+        gate.run = lambda gate=gate, entry=entry: restore_cached_result(gate, entry)
+        gate.cached = True
+    else:
+        gate.run = lambda gate=gate, key=key, run=gate.run: store_and_return(gate, key, run())
+
+def restore_cached_result(gate, entry):
+    age = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['created']))
+    print(f"♻️  {gate.name}: inputs unchanged, reusing result from {age}")
+    saved = GATE_CACHE_DIR / gate.slug
+    if gate.reports and saved.is_dir():
+        shutil.rmtree(gate.reports, ignore_errors=True)
+        shutil.copytree(saved, gate.reports)
+    return entry['success']
+
+def store_and_return(gate, key, success):
+    store_cached_result(gate, key, bool(success))
+    return success
+
+def run_gates(gates, jobs=4, force=False):
+    """Run gates concurrently in dependency order.
+
+    A gate is ready once the non-lazy gates it requires or runs after have
+    finished; its cache is checked then (see check_gate_cache). Lazy gates
+    only start when a ready gate that depends on them has to run.
+
+    Returns (name, status) pairs in declaration order, where status is
+    'pass', 'fail', 'skip' (a required gate did not pass) or 'idle' (a lazy
+    gate nothing needed).
+    """
+    status = {}
+    pending = list(gates)
+    by_name = {gate.name: gate for gate in gates}
+    lazy = {gate.name for gate in gates if gate.lazy}
+    wanted = set()
+    running = {}
+
+    def eager_deps(gate):
+        """Non-lazy gates to wait for, including those of the lazy gates depended on."""
+        deps = set()
+        for dep in gate.requires + gate.after:
+            if dep in lazy:
+                deps |= eager_deps(by_name[dep])
+            else:
+                deps.add(dep)
+        return deps
+    output = sys.stdout if isinstance(sys.stdout, GateOutput) else None
+
+    def run_gate(gate):
+        if output is not None:
+            output.set_label(gate.name)
+        metrics.set_gate(gate.name)
+        gate_context.deadline = time.monotonic() + gate.timeout
+        gate_context.log_path = str(LOG_DIR / f"{gate.slug}.log")
+        started = time.perf_counter()
+        try:
+            return bool(gate.run())
+        except Exception as e:
+            print_error(f"{gate.name} failed with exception: {e}")
+            return False
+        finally:
+            metrics.record_gate(gate.name, time.perf_counter() - started)
+            metrics.set_gate(None)
+            gate_context.deadline = gate_context.log_path = None
+            if output is not None:
+                output.set_label(None)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix='gate')
+    try:
+        while pending or running:
+            progress = True
+            while progress:
+                progress = False
+                for gate in list(pending):
+                    deps = gate.requires + gate.after
+                    if any(status.get(dep) in ('fail', 'skip') for dep in gate.requires):
+                        status[gate.name] = 'skip'
+                    elif gate.lazy and gate.name not in wanted:
+                        continue
+                    elif not all(dep in status for dep in eager_deps(gate)):
+                        continue
+                    else:
+                        if not gate.cache_checked:
+                            check_gate_cache(gate, force)
+                        waiting = {dep for dep in deps if dep in lazy and dep not in status}
+                        if waiting and not gate.cached:
+                            if not waiting <= wanted:
+                                wanted |= waiting
+                                progress = True
+                            continue
+                        running[executor.submit(run_gate, gate)] = gate
+                    pending.remove(gate)
+                    progress = True
+            if not running:
+                # Lazy gates nothing needed; anything else waits on a gate that was never declared
+                for gate in pending:
+                    status[gate.name] = 'idle' if gate.lazy and gate.name not in wanted else 'skip'
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                status[running.pop(future).name] = 'pass' if future.result() else 'fail'
+    except BaseException:
+        # Commands run in their own process groups, so Ctrl+C does not reach them
+        stop_running_commands()
+        raise
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return [(gate.name, status[gate.name]) for gate in gates]
+
 def run_command(cmd, description, allow_failure=False, cwd=None):
-    """Run a command and handle output."""
+    """Run a command, streaming its output to the console and the gate's log.
+
+    The command gets whatever is left of the current gate's timeout.
+    """
     print(f"{Colors.CYAN}Running: {cmd}{Colors.END}")
+    deadline = getattr(gate_context, 'deadline', None)
+    timeout = max(1.0, deadline - time.monotonic()) if deadline else DEFAULT_GATE_TIMEOUT
+    log_path = getattr(gate_context, 'log_path', None) or str(LOG_DIR / 'run_tests.log')
     
     try:
-        result = subprocess.run(
-            cmd, 
-            shell=True, 
-            capture_output=True, 
-            text=True, 
-            cwd=cwd,
-            timeout=120  # 2 minute timeout
-        )
+        # Output arrives on reader threads, which do not carry this gate's label
+        on_line = sys.stdout.line_writer() if isinstance(sys.stdout, GateOutput) else print
+        result = run_measured(cmd, cwd=cwd, timeout=timeout, log_path=log_path, on_line=on_line)
+        print(f"⏱️  {format_usage(result.metrics)}")
         
         if result.returncode == 0:
             print_success(f"{description} completed successfully")
-            if result.stdout.strip():
-                print(result.stdout.strip())
             return True
         else:
             if allow_failure:
-                print_warning(f"{description} completed with warnings")
-                if result.stderr.strip():
-                    print(result.stderr.strip())
+                print_warning(f"{description} completed with warnings (log: {log_path})")
                 return True
             else:
-                print_error(f"{description} failed")
-                if result.stderr.strip():
-                    print(result.stderr.strip())
+                print_error(f"{description} failed (log: {log_path})")
                 return False
                 
-    except subprocess.TimeoutExpired:
-        print_error(f"{description} timed out after 2 minutes")
+    except subprocess.TimeoutExpired as e:
+        print_error(f"{description} timed out after {e.timeout:.0f}s; stopped its process group (log: {log_path})")
         return False
     except Exception as e:
         print_error(f"{description} failed with exception: {e}")
@@ -96,8 +402,6 @@ def check_dependencies():
     print_step("Checking Dependencies", "🔧")
     
     required_tools = {
-        'jq': 'JSON processor (brew install jq)',
-        'lychee': 'Link checker (brew install lychee or cargo install lychee)',
         'pa11y-ci': 'Accessibility tester (npm install -g pa11y-ci)',
         'lhci': 'Lighthouse CI (npm install -g @lhci/cli)'
     }
@@ -130,7 +434,7 @@ def validate_json_config():
         return False
     
     return run_command(
-        f"jq empty {config_path}",
+        f"python3 _scripts/validate_config.py {config_path}",
         "JSON configuration validation"
     )
 
@@ -143,60 +447,114 @@ def generate_resume_files():
         "Resume file generation"
     )
 
-def start_local_server(port=8001):
-    """Start local development server."""
-    print_step(f"Starting Local Server on Port {port}", "🚀")
+def bundle_config():
+    """Write the fingerprinted site.config bundles and point index.html at them."""
+    print_step("Bundling Site Configuration", "📦")
     
-    # Check if port is already in use
-    result = subprocess.run(
-        f"lsof -ti:{port}",
-        shell=True,
-        capture_output=True
+    return run_command(
+        "python3 _scripts/bundle_config.py",
+        "Config bundling"
     )
+
+def build_image_derivatives():
+    """Encode responsive image derivatives and write their manifest."""
+    print_step("Building Image Derivatives", "🖼️")
     
-    if result.returncode == 0:
-        print_warning(f"Port {port} is already in use")
-        pids = result.stdout.decode().strip().split('\n')
-        for pid in pids:
-            if pid:
-                print(f"Killing process {pid}")
-                try:
-                    os.kill(int(pid), signal.SIGTERM)
-                    time.sleep(1)
-                except:
-                    pass
-    
-    # Start server in background
-    env = os.environ.copy()
-    env['PORT'] = str(port)
-    
-    server_process = subprocess.Popen(
-        ["python3", "_scripts/serve.py"],
-        env=env,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
+    return run_command(
+        "python3 _scripts/build_images.py",
+        "Image derivatives"
     )
+
+def prerender_index():
+    """Prerender the config-driven sections into index.html."""
+    print_step("Prerendering index.html", "🧱")
     
-    # Wait for server to start
-    print("⏳ Waiting for server to start...")
-    for i in range(30):  # Wait up to 30 seconds
-        try:
-            result = subprocess.run(
-                f"curl -s http://localhost:{port} >/dev/null",
-                shell=True,
-                timeout=2
+    return run_command(
+        "python3 _scripts/prerender.py",
+        "Prerendering"
+    )
+
+def compress_assets():
+    """Precompress text assets for the local server."""
+    print_step("Precompressing Assets", "🗜️")
+    
+    return run_command(
+        "python3 _scripts/compress_assets.py",
+        "Asset precompression"
+    )
+
+def start_local_server(port=8001, timeout=30):
+    """Start local development server; returns (process, port) or None.
+
+    serve.py writes its port to an inherited pipe as soon as it is listening,
+    so there is nothing to poll. Port 0 lets it pick a free ephemeral port,
+    which keeps concurrent runs apart.
+    """
+    print_step(f"Starting Local Server on Port {port}" if port else "Starting Local Server on a Free Port", "🚀")
+    
+    # Stop whatever is already listening on the port
+    pids = port_listeners(port) if port else []
+    if pids:
+        print_warning(f"Port {port} is already in use")
+        names = {pid: process_name(pid) for pid in pids}
+        for pid, outcome in terminate(pids).items():
+            print(f"Stopping process {pid} ({names[pid]}): {outcome}")
+    
+    # Start server in background. Its output goes to a file: nobody reads a
+    # pipe while the gates run, and a full pipe would stall the server.
+    server_log = LOG_DIR / 'server.log'
+    access_log = LOG_DIR / 'access.log'
+    ready_read, ready_write = os.pipe()
+    started = time.perf_counter()
+    try:
+        with open(server_log, 'ab') as log:
+            server_process = subprocess.Popen(
+                ["python3", "_scripts/serve.py", "--port", str(port), "--ready-fd", str(ready_write),
+                 "--access-log", str(access_log), "--access-log-format", "json"],
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                pass_fds=(ready_write,)
             )
-            if result.returncode == 0:
-                print_success(f"Server is running on http://localhost:{port}")
-                return server_process
-        except:
-            pass
-        time.sleep(1)
-    
-    print_error("Server failed to start")
+    finally:
+        os.close(ready_write)
+    
+    # Wait for the port on the ready pipe; EOF without one means serve.py exited
+    print("⏳ Waiting for server to start...")
+    with os.fdopen(ready_read, 'r') as ready:
+        readable, _, _ = select.select([ready], [], [], timeout)
+        line = ready.readline().strip() if readable else ''
+    if line.isdigit():
+        port = int(line)
+        print_success(f"Server is running on http://localhost:{port} "
+                      f"(ready in {(time.perf_counter() - started) * 1000:.0f} ms; log: {server_log}, "
+                      f"requests: {access_log})")
+        return server_process, port
+    
+    if readable:
+        print_error("Server exited before it was ready")
+    else:
+        print_error(f"Server was not ready after {timeout}s")
     server_process.terminate()
+    try:
+        server_process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        server_process.kill()
+    print(server_log.read_text(errors='replace').strip())
     return None
 
+def snapshot_server_metrics(port):
+    """Save the local server's /__metrics (see serve.py) next to the gate metrics."""
+    path = os.path.join(METRICS_DIR, 'server.prom')
+    try:
+        with urllib.request.urlopen(f"http://localhost:{port}/__metrics", timeout=5) as response:
+            body = response.read()
+    except OSError as e:
+        print_warning(f"Could not read server metrics: {e}")
+        return None
+    with open(path, 'wb') as f:
+        f.write(body)
+    return path
+
 def check_broken_links():
     """Check for broken links."""
     print_step("Checking for Broken Links", "🔗")
@@ -204,16 +562,10 @@ def check_broken_links():
     # Create consolidated test reports directory
     os.makedirs('test-reports/lychee', exist_ok=True)
 
-    run_command(
-        "pwd; ls -la",
-        "Check pwd",
-        allow_failure=False  # Links should be valid
-    )
-
     return run_command(
-        "lychee --config test/lychee.toml .",
+        "python3 _scripts/check_links.py --config test/lychee.toml",
         "Link validation",
-        allow_failure=True  # Links should be valid
+        allow_failure=False  # Links should be valid
     )
 
 def run_accessibility_tests(port=8001):
@@ -269,11 +621,47 @@ def run_lighthouse_tests(port=8001):
     
     return result
 
+def run_load_test(port=8001):
+    """Drive the local server with load_gen.py and compare with the stored baseline."""
+    print_step("Running Server Load Test", "🏋️")
+
+    os.makedirs('test-reports/load', exist_ok=True)
+    cmd = (f"python3 _scripts/load_gen.py --url http://localhost:{port} --duration 10 "
+           f"--output test-reports/load/results.json")
+    if LOAD_BASELINE.exists():
+        cmd += f" --baseline {LOAD_BASELINE}"
+    else:
+        print_warning(f"No {LOAD_BASELINE}; results are not compared "
+                      f"(copy test-reports/load/results.json there to start)")
+    return run_command(cmd, "Server load test")
+
+def record_performance_history():
+    """Store this run's Lighthouse and pa11y numbers and compare them with history."""
+    print_step("Recording Performance History", "📈")
+    
+    if not run_command(
+        "python3 _scripts/perf_history.py ingest",
+        "Performance history ingest"
+    ):
+        return False
+    # Regressions are reported, not enforced: one noisy run should not block a push
+    return run_command(
+        "python3 _scripts/perf_history.py report",
+        "Performance trend check"
+    )
+
 def main():
     """Main test runner."""
     parser = argparse.ArgumentParser(description='Run local quality assurance tests')
     parser.add_argument('--skip-deps', action='store_true', help='Skip dependency checks')
-    parser.add_argument('--port', type=int, default=8001, help='Port for local server (default: 8001)')
+    parser.add_argument('--port', type=int, default=8001,
+                        help='Port for local server, 0 for any free port (default: 8001)')
+    parser.add_argument('--jobs', type=int, default=4, help='Gates to run concurrently (default: 4)')
+    parser.add_argument('--force', action='store_true', help='Ignore cached gate results')
+    parser.add_argument('--baseline', help='Compare gate metrics with this summary.json')
+    parser.add_argument('--save-baseline', help="Copy this run's summary.json to this path")
+    parser.add_argument('--load-test', action='store_true',
+                        help=f'Also load-test the local server against {LOAD_BASELINE}')
     
     args = parser.parse_args()
     
@@ -286,51 +674,73 @@ def main():
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     os.chdir(project_root)
+    metrics.open()
+    shutil.rmtree(LOG_DIR, ignore_errors=True)
+    LOG_DIR.mkdir(parents=True)
     
-    # Track results
-    results = []
-    server_process = None
-    
+    server = {}
+
+    def check_dependencies_gate():
+        success = check_dependencies()
+        if not success:
+            print_error("Please install missing dependencies before continuing")
+        return success
+
+    def start_server_gate():
+        started = start_local_server(args.port)
+        if started is None:
+            return False
+        server['process'], server['port'] = started
+        return True
+
+    # Quality gates and what each one needs before it can start
+    deps = [] if args.skip_deps else ["Dependency Check"]
+    gates = [
+        Gate("JSON Validation", validate_json_config, requires=deps, timeout=30),
+        Gate("Resume Generation", generate_resume_files, requires=deps, timeout=180),
+        Gate("Config Bundles", bundle_config, requires=deps, timeout=30),
+        Gate("Image Derivatives", build_image_derivatives, requires=deps, timeout=300),
+        # Both rewrite index.html, so they run one after the other; prerender
+        # also reads the image manifest
+        Gate("Prerender", prerender_index, requires=deps, after=["Config Bundles", "Image Derivatives"],
+             timeout=30),
+        Gate("Asset Compression", compress_assets, requires=deps, after=["Prerender"], timeout=60),
+        Gate("Local Server", start_server_gate, requires=deps, after=["Asset Compression"], lazy=True),
+        # Checks the relative links of the final index.html and bundles
+        Gate("Link Validation", check_broken_links, requires=deps, after=["Prerender", "Asset Compression"],
+             timeout=300,
+             inputs=['index.html', 'sitemap.xml', 'assets/data/*', '_scripts/check_links.py'],
+             config='test/lychee.toml', reports='test-reports/lychee', max_age=24 * 3600),
+        Gate("Accessibility Tests", lambda: run_accessibility_tests(server['port']), requires=["Local Server"],
+             timeout=300, inputs=SITE_INPUTS, config='test/pa11yci.json', reports='test-reports/pa11y',
+             tools=['pa11y-ci']),
+        Gate("Performance Tests", lambda: run_lighthouse_tests(server['port']), requires=["Local Server"],
+             timeout=600, inputs=SITE_INPUTS, config='test/lighthouserc.json', reports='test-reports/lighthouse',
+             tools=['lhci']),
+        Gate("Performance History", record_performance_history,
+             after=["Accessibility Tests", "Performance Tests"], timeout=60),
+    ]
+    if args.load_test:
+        # Last, so no other gate's requests skew the numbers
+        gates.append(Gate("Load Test", lambda: run_load_test(server['port']), requires=["Local Server"],
+                          after=["Link Validation", "Accessibility Tests", "Performance Tests"], timeout=120))
+    if not args.skip_deps:
+        gates.insert(0, Gate("Dependency Check", check_dependencies_gate))
+    
+    stdout = sys.stdout
+    if args.jobs > 1:
+        sys.stdout = GateOutput(stdout)
     try:
-        # 1. Check dependencies (unless skipped)
-        if not args.skip_deps:
-            success = check_dependencies()
-            results.append(("Dependency Check", success))
-            if not success:
-                print_error("Please install missing dependencies before continuing")
-                return 1
-        
-        # 2. Validate JSON configuration
-        success = validate_json_config()
-        results.append(("JSON Validation", success))
-        
-        # 3. Generate resume files
-        success = generate_resume_files()
-        results.append(("Resume Generation", success))
-        
-        # 4. Start local server
-        server_process = start_local_server(args.port)
-        if not server_process:
-            results.append(("Local Server", False))
-            return 1
-        results.append(("Local Server", True))
-        
-        # 5. Check broken links
-        success = check_broken_links()
-        results.append(("Link Validation", success))
-        
-        # 6. Run accessibility tests
-        success = run_accessibility_tests(args.port)
-        results.append(("Accessibility Tests", success))
-        
-        # 7. Run Lighthouse tests
-        success = run_lighthouse_tests(args.port)
-        results.append(("Performance Tests", success))
-        
+        results = run_gates(gates, args.jobs, force=args.force)
     finally:
+        sys.stdout = stdout
         # Stop server
-        if server_process:
+        if server.get('process'):
+            server_process = server['process']
             print_step("Stopping Local Server", "🛑")
+            metrics_path = snapshot_server_metrics(server['port'])
+            if metrics_path:
+                print(f"📈 Server metrics: {metrics_path}")
             server_process.terminate()
             try:
                 server_process.wait(timeout=5)
@@ -342,13 +752,37 @@ def main():
     # Print summary
     print_step("Quality Gate Summary", "📊")
     
+    labels = {'pass': "✅ PASS", 'fail': "❌ FAIL", 'skip': "⏭️  SKIP", 'idle': "💤 IDLE"}
+    cached = {gate.name for gate in gates if gate.cached}
+    summary = metrics.summarize(results, cached)
     all_passed = True
-    for test_name, success in results:
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}")
-        if not success:
+    for test_name, status in results:
+        note = " (cached)" if test_name in cached else ""
+        timing = summary['gates'][test_name]
+        if status in ('pass', 'fail'):
+            note += f" — {timing['wall_s']:.1f}s, {timing['cpu_s']:.1f}s CPU"
+        print(f"{labels[status]} {test_name}{note}")
+        if status not in ('pass', 'idle'):
             all_passed = False
     
+    if args.baseline:
+        try:
+            summary['regressions'] = compare_to_baseline(summary, load_baseline(args.baseline))
+        except (OSError, ValueError) as e:
+            print_warning(f"Could not read baseline {args.baseline}: {e}")
+        else:
+            print()
+            for regression in summary['regressions']:
+                print_warning(f"{regression['gate']}: {regression['metric']} {regression['baseline']} → "
+                              f"{regression['current']} (baseline {args.baseline})")
+            if not summary['regressions']:
+                print_success(f"No regressions against {args.baseline}")
+    summary_path = metrics.write_summary(summary)
+    print(f"📈 Gate metrics: {summary_path} and commands.jsonl")
+    if args.save_baseline:
+        shutil.copyfile(summary_path, args.save_baseline)
+        print(f"📈 Saved baseline to {args.save_baseline}")
+    
     print()
     if all_passed:
         print_success("🎉 All quality gates passed! Ready for deployment.")
@@ -2,41 +2,1090 @@
 """
 Local development server for the portfolio website.
 Serves the site on localhost:8000 (as specified in CLAUDE.md)
+
+Usage:
+    python3 _scripts/serve.py [--mode threaded] [--workers 16] [--port 8000]
+
+Options:
+    --mode       Concurrency mode (default: threaded, or $SERVE_MODE):
+                   single    one connection at a time (plain TCPServer)
+                   threaded  one thread per connection (ThreadingMixIn)
+                   pool      bounded thread pool of --workers threads
+                   asyncio   event loop for connections, --workers threads for file I/O
+    --workers    Thread count for the pool and asyncio modes (default: 16)
+    --port       Port to listen on, 0 for any free port (default: $PORT or 8000)
+    --ready-fd   Inherited file descriptor to write the bound port to, followed
+                 by a newline, once the server accepts connections; the fd is
+                 then closed, so a reader sees EOF without a port if startup fails
+    --cache-mb   In-memory file cache size in MB, 0 to disable (default: 16)
+    --cache-max-entry-kb
+                 Files larger than this are always read from disk (default: 256)
+    --keep-alive Speak HTTP/1.1 and keep connections open between requests
+    --idle-timeout
+                 Seconds an idle keep-alive connection stays open (default: 5)
+    --max-requests
+                 Requests served on one connection before it is closed (default: 100)
+    --access-log Where the access log goes: a file path, - for stderr, or off
+                 (default: -). Lines are queued and written by a background
+                 thread, so a slow terminal or a full pipe never stalls a request
+    --access-log-format
+                 common (Apache-style lines) or json (one object per request)
+    --access-log-sample
+                 Fraction of successful requests to log (default: 1); errors
+                 (4xx/5xx) are always logged
+    --no-metrics Do not collect request metrics or serve /__metrics
+    --watch      Rebuild what changed (see watch.py) and reload open tabs; HTML
+                 is served with a small script that listens on /__livereload
+                 (Server-Sent Events). Needs the threaded or pool mode
+    --poll       With --watch, poll file stats instead of using inotify
+    --debounce   With --watch, seconds of quiet before rebuilding (default: 0.1)
+
+Request counts, bytes sent and latency histograms per method, path and
+status, open connections and file cache hits are served in Prometheus text
+format at /__metrics.
 """
 
+import argparse
+import asyncio
+import datetime
+import email.utils
+import errno
+import hashlib
 import http.server
-import socketserver
+import io
+import json
 import os
+import random
+import re
+import signal
+import socket
+import socketserver
+import stat
 import sys
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from watch import DEFAULT_DEBOUNCE, watch
+
+MODES = ('single', 'threaded', 'pool', 'asyncio')
+DEFAULT_WORKERS = 16
+DEFAULT_CACHE_MB = 16
+DEFAULT_CACHE_MAX_ENTRY_KB = 256
+DEFAULT_IDLE_TIMEOUT = 5.0
+DEFAULT_MAX_REQUESTS = 100
+ACCESS_LOG_FORMATS = ('common', 'json')
+ACCESS_LOG_CAPACITY = 10000
+ACCESS_LOG_FLUSH_INTERVAL = 0.5
+METRICS_PATH = '/__metrics'
+# Upper bounds in seconds of the request duration histogram buckets (+Inf is implied)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Distinct path labels kept; later paths share the "other" label
+METRICS_MAX_PATHS = 256
+LIVERELOAD_PATH = '/__livereload'
+# Comment lines sent on an idle event stream so proxies and browsers keep it open
+LIVERELOAD_PING_INTERVAL = 15.0
+LIVERELOAD_SNIPPET = (f"<script>new EventSource('{LIVERELOAD_PATH}')"
+                      ".addEventListener('reload', () => location.reload());</script>").encode('ascii')
+# --watch holds a handler open per tab, which only these modes can spare
+WATCH_MODES = ('threaded', 'pool')
+
+# Precompressed siblings written by compress_assets.py, in order of preference
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json',
+                      'application/xml', 'image/svg+xml')
+
+# Content-hashed filenames (bundle_config.py) never change content, so clients may keep them
+FINGERPRINTED = re.compile(r'\.[0-9a-f]{10}\.[A-Za-z0-9]+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+CacheEntry = namedtuple('CacheEntry', 'body etag mtime_ns size')
+
+
+class FileCache:
+    """Bounded LRU cache of file contents keyed by path and mtime.
+
+    Files over max_entry_bytes are never cached, so a few large images
+    cannot evict the small HTML/JSON/JS files that every page load needs.
+    """
+
+    def __init__(self, max_bytes, max_entry_bytes):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, st):
+        """Return the entry for a file whose stat result is st, loading it if stale.
+
+        Returns None when the file is too large to cache.
+        """
+        if st.st_size > self.max_entry_bytes:
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        with open(path, 'rb') as f:
+            body = f.read()
+            fs = os.fstat(f.fileno())
+        if len(body) > self.max_entry_bytes:
+            return None
+        entry = CacheEntry(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+                           fs.st_mtime_ns, len(body))
+
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self.total_bytes -= old.size
+            self._entries[path] = entry
+            self.total_bytes += entry.size
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.size
+        return entry
+
+
+class AccessLog:
+    """Access log written by a background thread.
+
+    Request threads (or the event loop's workers) only append a record to a
+    bounded deque, which never blocks. A writer thread formats and writes
+    queued records every ACCESS_LOG_FLUSH_INTERVAL seconds, or sooner when a
+    batch builds up. If the writer falls behind by more than `capacity`
+    records the oldest are dropped and counted rather than slowing requests.
+    """
+
+    def __init__(self, stream, fmt='common', sample=1.0, capacity=ACCESS_LOG_CAPACITY):
+        self.stream = stream
+        self.fmt = fmt
+        self.sample = sample
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)
+        self._dropped = 0
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name='access-log', daemon=True)
+        self._writer.start()
+
+    def request(self, client, method, path, status, size, duration_ms, user_agent):
+        """Queue one request; successful ones are sampled."""
+        if status < 400 and self.sample < 1.0 and random.random() >= self.sample:
+            return
+        self._append({'time': time.time(), 'client': client, 'method': method, 'path': path,
+                      'status': status, 'size': size, 'duration_ms': duration_ms, 'user_agent': user_agent})
+
+    def message(self, client, text):
+        """Queue a free-form server message (errors from the request handler)."""
+        self._append({'time': time.time(), 'client': client, 'message': text})
+
+    def _append(self, record):
+        if len(self._records) == self.capacity:
+            self._dropped += 1
+        self._records.append(record)
+        if len(self._records) >= 256:
+            self._wake.set()
+
+    def _format(self, record):
+        if self.fmt == 'json':
+            return json.dumps(record, separators=(',', ':'))
+        stamp = time.strftime('%d/%b/%Y:%H:%M:%S %z', time.localtime(record['time']))
+        if 'message' in record:
+            return f"{record['client']} - - [{stamp}] {record['message']}"
+        size = '-' if record['size'] is None else record['size']
+        return (f"{record['client']} - - [{stamp}] \"{record['method']} {record['path']}\" "
+                f"{record['status']} {size} {record['duration_ms']:.1f}ms")
+
+    def _drain(self):
+        lines = []
+        while self._records:
+            lines.append(self._format(self._records.popleft()))
+        if self._dropped:
+            dropped, self._dropped = self._dropped, 0
+            lines.append(self._format({'time': time.time(), 'client': '-',
+                                       'message': f'access log fell behind; dropped {dropped} records'}))
+        if lines:
+            try:
+                self.stream.write('\n'.join(lines) + '\n')
+                self.stream.flush()
+            except (OSError, ValueError):
+                pass  # nowhere to log to; keep serving
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(ACCESS_LOG_FLUSH_INTERVAL)
+            self._wake.clear()
+            self._drain()
+
+    def close(self):
+        """Write whatever is still queued and stop the writer."""
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=2)
+        self._drain()
+
+
+def prometheus_escape(value):
+    """Escape a label value for the Prometheus text format."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class ServerMetrics:
+    """Request counters and latency histograms, exposed in Prometheus text format.
+
+    Every thread that serves requests updates its own shard (per-thread
+    dicts), so recording a request takes no lock. A scrape sums the shards;
+    a shard that is being updated at that moment may be one request ahead
+    in one series, which is fine for monitoring. The only lock is taken the
+    first time a thread records anything and when a new path label appears.
+    Shards of threads that have exited (one per connection in threaded mode)
+    are folded into a single retired shard, so they do not pile up.
+    """
+
+    def __init__(self, file_cache=None, max_paths=METRICS_MAX_PATHS):
+        self.file_cache = file_cache
+        self.max_paths = max_paths
+        self.started = time.time()
+        self._paths = set()
+        self._shards = {}
+        self._retired = self._new_shard()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @staticmethod
+    def _new_shard():
+        return {'requests': {}, 'connections': [0, 0]}
+
+    @staticmethod
+    def _add(total, shard):
+        for key, series in shard['requests'].copy().items():
+            into = total['requests'].setdefault(key, [0] * len(series))
+            for i, value in enumerate(series):
+                into[i] += value
+        for i, value in enumerate(shard['connections']):
+            total['connections'][i] += value
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = self._new_shard()
+            with self._lock:
+                for thread in [t for t in self._shards if not t.is_alive()]:
+                    self._add(self._retired, self._shards.pop(thread))
+                self._shards[threading.current_thread()] = shard
+        return shard
+
+    def _path_label(self, path):
+        path = urllib.parse.urlsplit(path or '').path or '-'
+        if path in self._paths:
+            return path
+        with self._lock:
+            if len(self._paths) < self.max_paths:
+                self._paths.add(path)
+                return path
+        return 'other'
+
+    def observe(self, method, path, status, size, seconds):
+        """Record one response: count, bytes sent and duration."""
+        key = (method or '-', self._path_label(path), status)
+        requests = self._shard()['requests']
+        series = requests.get(key)
+        if series is None:
+            # count, duration sum, bytes, then one count per bucket (+Inf last)
+            series = requests[key] = [0] * (3 + len(LATENCY_BUCKETS) + 1)
+        series[0] += 1
+        series[1] += seconds
+        series[2] += size or 0
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                series[3 + i] += 1
+                break
+        else:
+            series[-1] += 1
+
+    def connection_opened(self):
+        connections = self._shard()['connections']
+        connections[0] += 1
+        connections[1] += 1
+
+    def connection_closed(self):
+        self._shard()['connections'][1] -= 1
+
+    def _merged(self):
+        total = self._new_shard()
+        with self._lock:
+            self._add(total, self._retired)
+            for shard in self._shards.values():
+                self._add(total, shard)
+        return total['requests'], total['connections'][0], total['connections'][1]
+
+    def render(self):
+        """The current values in Prometheus text exposition format 0.0.4."""
+        requests, opened, in_flight = self._merged()
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        def labels(key, **extra):
+            method, path, status = key
+            pairs = {'method': method, 'path': path, 'status': str(status), **extra}
+            return '{' + ','.join(f'{k}="{prometheus_escape(v)}"' for k, v in pairs.items()) + '}'
+
+        keys = sorted(requests, key=lambda k: (k[1], k[0], k[2]))
+        family('serve_requests_total', 'counter', 'Responses sent, by method, path and status.')
+        lines += [f'serve_requests_total{labels(k)} {requests[k][0]}' for k in keys]
+        family('serve_response_bytes_total', 'counter', 'Body bytes sent, by method, path and status.')
+        lines += [f'serve_response_bytes_total{labels(k)} {requests[k][2]}' for k in keys]
+        family('serve_request_duration_seconds', 'histogram',
+               'Time from reading the request line to sending the response headers.')
+        for k in keys:
+            series = requests[k]
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), series[3:]):
+                cumulative += count
+                lines.append(f'serve_request_duration_seconds_bucket{labels(k, le=str(bound))} {cumulative}')
+            lines.append(f'serve_request_duration_seconds_sum{labels(k)} {series[1]:.6f}')
+            lines.append(f'serve_request_duration_seconds_count{labels(k)} {series[0]}')
+
+        family('serve_connections_total', 'counter', 'Client connections accepted.')
+        lines.append(f'serve_connections_total {opened}')
+        family('serve_connections_in_flight', 'gauge', 'Client connections currently open.')
+        lines.append(f'serve_connections_in_flight {in_flight}')
+        cache = self.file_cache
+        if cache is not None:
+            family('serve_file_cache_hits_total', 'counter', 'Files served from the in-memory cache.')
+            lines.append(f'serve_file_cache_hits_total {cache.hits}')
+            family('serve_file_cache_misses_total', 'counter', 'Cacheable files read from disk.')
+            lines.append(f'serve_file_cache_misses_total {cache.misses}')
+            family('serve_file_cache_bytes', 'gauge', 'Bytes held by the in-memory cache.')
+            lines.append(f'serve_file_cache_bytes {cache.total_bytes}')
+        family('serve_start_time_seconds', 'gauge', 'Unix time the server started.')
+        lines.append(f'serve_start_time_seconds {self.started:.3f}')
+        return '\n'.join(lines) + '\n'
+
+
+class LiveReload:
+    """Tells browsers watching /__livereload that the site was rebuilt."""
+
+    def __init__(self):
+        self.version = 0
+        self.changed = []
+        self.closed = False
+        self._condition = threading.Condition()
+
+    def notify(self, changed):
+        with self._condition:
+            self.version += 1
+            self.changed = changed
+            self._condition.notify_all()
+
+    def wait(self, version, timeout):
+        """Block until a rebuild newer than version; returns (version, changed paths or None)."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version or self.closed, timeout)
+            if self.version == version:
+                return version, None
+            return self.version, self.changed
+
+    def close(self):
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+
+def open_access_log(target, fmt='common', sample=1.0):
+    """AccessLog for a --access-log value, or None when logging is off."""
+    if target == 'off':
+        return None
+    stream = sys.stderr if target == '-' else open(target, 'a', buffering=1 << 16)
+    return AccessLog(stream, fmt, sample)
+
+
+def parse_accept_encoding(header):
+    """Map each content-coding in an Accept-Encoding header to its q-value."""
+    codings = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def stat_etag(st):
+    """Strong validator for files served straight from disk (mtime + size, as nginx does)."""
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+class Handler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler shared by every concurrency mode.
+
+    Regular files are served from the server's FileCache when they fit, with
+    a strong ETag and Last-Modified so repeat loads revalidate with a 304.
+    Text assets are sent as their precompressed .br/.gz sibling when the
+    client accepts it; nothing is compressed per request. Single byte ranges
+    are answered with 206 Partial Content so interrupted downloads resume.
+    Directory redirects, listings and errors fall through to the stock
+    SimpleHTTPRequestHandler behaviour.
+
+    With server.keep_alive the handler speaks HTTP/1.1: connections stay open
+    until the client asks to close, the idle timeout expires or
+    server.max_requests responses have been sent on them.
+    """
+
+    _body_range = None
+    _connection_header_sent = False
+
+    def __init__(self, request, client_address, server):
+        if server.keep_alive:
+            self.protocol_version = 'HTTP/1.1'
+            self.timeout = server.idle_timeout
+        super().__init__(request, client_address, server, directory=server.directory)
+
+    def setup(self):
+        self.requests_handled = 0
+        super().setup()
+        # Headers and body are separate writes; without this, Nagle's algorithm
+        # holds the body back for a delayed ACK on every keep-alive response.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.server.metrics is not None:
+            self.server.metrics.connection_opened()
+
+    def parse_request(self):
+        # Per-request state; on a keep-alive connection the handler outlives the
+        # request, and HEAD responses never reach copyfile() to clear the range
+        self._started = time.perf_counter()
+        self._body_range = None
+        self._connection_header_sent = False
+        if not super().parse_request():
+            return False
+        self.requests_handled += 1
+        if self.requests_handled >= self.server.max_requests:
+            self.close_connection = True
+        return True
+
+    def finish(self):
+        super().finish()
+        if self.server.metrics is not None:
+            self.server.metrics.connection_closed()
+
+    def log_request(self, code='-', size='-'):
+        access_log, metrics = self.server.access_log, self.server.metrics
+        if access_log is None and metrics is None:
+            return
+        code = int(code)
+        started = getattr(self, '_started', None)
+        seconds = time.perf_counter() - started if started is not None else 0.0
+        # Only 200/206 set the range this response will send; HEAD sends no body
+        length = None
+        if code in (200, 206) and self._body_range is not None and self.command != 'HEAD':
+            length = self._body_range[1]
+        path = getattr(self, 'path', None)
+        if metrics is not None:
+            metrics.observe(self.command, path, code, length, seconds)
+        if access_log is not None:
+            headers = getattr(self, 'headers', None)
+            access_log.request(self.address_string(), self.command, path, code, length,
+                               round(seconds * 1000, 2), headers.get('User-Agent') if headers else None)
+
+    def log_message(self, format, *args):
+        # Only errors get here (log_request is overridden); nothing goes to stderr directly
+        if self.server.access_log is not None:
+            self.server.access_log.message(self.address_string(), format % args)
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'connection':
+            self._connection_header_sent = True
+        super().send_header(keyword, value)
+
+    def end_headers(self):
+        # Tell the client what happens to the connection after this response
+        if self.server.keep_alive and not self._connection_header_sent:
+            if self.close_connection:
+                super().send_header('Connection', 'close')
+            elif self.request_version == 'HTTP/1.0':
+                super().send_header('Connection', 'keep-alive')
+        self._connection_header_sent = False
+        super().end_headers()
+
+    def do_GET(self):
+        if self.server.livereload is not None and urllib.parse.urlsplit(self.path).path == LIVERELOAD_PATH:
+            self._stream_livereload()
+            return
+        super().do_GET()
+
+    def send_head(self):
+        if self.server.metrics is not None and urllib.parse.urlsplit(self.path).path == METRICS_PATH:
+            return self._send_generated(self.server.metrics.render().encode('utf-8'),
+                                        "text/plain; version=0.0.4; charset=utf-8")
+        resolved = self._resolve_file()
+        if resolved is None:
+            return super().send_head()
+        path, st = resolved
+        ctype = self.guess_type(path)
+        if self.server.livereload is not None and ctype == 'text/html':
+            return self._send_live_html(path)
+        immutable = FINGERPRINTED.search(path) is not None
+        negotiated = ctype.startswith(COMPRESSIBLE_TYPES)
+        encoding = None
+        if negotiated:
+            encoding, path, st = self._select_encoding(path, st)
+
+        cache = self.server.file_cache
+        entry = cache.get(path, st) if cache is not None else None
+        if entry is not None:
+            etag, mtime, body = entry.etag, entry.mtime_ns / 1e9, io.BytesIO(entry.body)
+        else:
+            etag, mtime, body = stat_etag(st), st.st_mtime, None
+
+        if self._not_modified(etag, mtime):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", self.date_time_string(mtime))
+            if negotiated:
+                self.send_header("Vary", "Accept-Encoding")
+            if immutable:
+                self.send_header("Cache-Control", IMMUTABLE_CACHE_CONTROL)
+            self.end_headers()
+            return None
+
+        size = entry.size if entry is not None else st.st_size
+        byte_range = self._requested_range(size, etag, mtime)
+        if byte_range is False:
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+
+        if body is None:
+            try:
+                body = open(path, 'rb')
+            except OSError:
+                self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+                return None
+
+        if byte_range is None:
+            self._body_range = (0, size)
+            self.send_response(HTTPStatus.OK)
+        else:
+            start, end = byte_range
+            self._body_range = (start, end - start + 1)
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-type", ctype)
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        if negotiated:
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(self._body_range[1]))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Last-Modified", self.date_time_string(mtime))
+        self.send_header("ETag", etag)
+        if immutable:
+            self.send_header("Cache-Control", IMMUTABLE_CACHE_CONTROL)
+        self.end_headers()
+        return body
+
+    def _send_generated(self, body, ctype):
+        """Send a body built for this request; never cached, compressed or ranged."""
+        self._body_range = (0, len(body))
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def _send_live_html(self, path):
+        """The page with the live reload client added before </body>."""
+        try:
+            with open(path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        end = body.rfind(b'</body>')
+        if end == -1:
+            end = len(body)
+        return self._send_generated(body[:end] + LIVERELOAD_SNIPPET + body[end:], "text/html; charset=utf-8")
+
+    def _stream_livereload(self):
+        """Hold the request open as an event stream; send "reload" after every rebuild."""
+        livereload = self.server.livereload
+        self.close_connection = True
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        version = livereload.version
+        try:
+            self.wfile.write(b'retry: 1000\n\n')
+            self.wfile.flush()
+            while not livereload.closed:
+                version, changed = livereload.wait(version, LIVERELOAD_PING_INTERVAL)
+                if changed is None:
+                    self.wfile.write(b': ping\n\n')
+                else:
+                    self.wfile.write(f'event: reload\ndata: {json.dumps(changed)}\n\n'.encode('utf-8'))
+                self.wfile.flush()
+        except OSError:
+            pass  # the tab went away
+
+    def copyfile(self, source, outputfile):
+        """Send the selected byte range of the body.
+
+        Files on disk go out with socket.sendfile() (os.sendfile, no copy
+        through Python buffers); cached bodies are written from a memoryview.
+        """
+        byte_range, self._body_range = self._body_range, None
+        if byte_range is None:
+            return super().copyfile(source, outputfile)
+        offset, count = byte_range
+        if isinstance(source, io.BytesIO):
+            # Release the views even when write() raises, or closing source
+            # fails with BufferError and hides the original exception
+            with source.getbuffer() as view, view[offset:offset + count] as chunk:
+                outputfile.write(chunk)
+        elif isinstance(self.connection, socket.socket):
+            self.connection.sendfile(source, offset, count)
+        else:
+            source.seek(offset)
+            while count > 0:
+                chunk = source.read(min(count, 64 * 1024))
+                if not chunk:
+                    break
+                outputfile.write(chunk)
+                count -= len(chunk)
+
+    def _requested_range(self, size, etag, mtime):
+        """Evaluate Range and If-Range for a representation of the given size.
+
+        Returns (start, end) inclusive for a single satisfiable range, False if
+        the range cannot be satisfied (416), or None to send the whole body.
+        Multi-range requests are answered with the whole body, which RFC 9110
+        allows.
+        """
+        header = self.headers.get("Range")
+        if header is None or self.command not in ("GET", "HEAD"):
+            return None
+        if_range = self.headers.get("If-Range")
+        if if_range is not None and if_range.strip() not in (etag, self.date_time_string(mtime)):
+            return None
+
+        unit, _, spec = header.partition("=")
+        if unit.strip().lower() != "bytes" or "," in spec:
+            return None
+        first, sep, last = spec.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else size - 1
+                if start < size and end < start:
+                    return None
+            else:
+                suffix = int(last)
+                if suffix == 0:
+                    return False
+                start, end = max(0, size - suffix), size - 1
+        except ValueError:
+            return None
+        if start >= size:
+            return False
+        return start, min(end, size - 1)
+
+    def _select_encoding(self, path, st):
+        """Pick the best precompressed sibling the client accepts.
+
+        Returns (content-coding or None, path, stat) of the representation to
+        send. Siblings older than the source are treated as stale and skipped.
+        """
+        accepted = parse_accept_encoding(self.headers.get("Accept-Encoding", ""))
+        best = (0.0, None, path, st)
+        for coding, suffix in PRECOMPRESSED:
+            q = accepted.get(coding, accepted.get('*', 0.0))
+            if q <= best[0]:
+                continue
+            try:
+                variant_st = os.stat(path + suffix)
+            except OSError:
+                continue
+            if stat.S_ISREG(variant_st.st_mode) and variant_st.st_mtime_ns >= st.st_mtime_ns:
+                best = (q, coding, path + suffix, variant_st)
+        return best[1:]
+
+    def _resolve_file(self):
+        """Map the request path to (path, stat) of a regular file, or None.
+
+        None leaves redirects, directory listings and 404s to the base class.
+        """
+        path = self.translate_path(self.path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if stat.S_ISDIR(st.st_mode):
+            if not urllib.parse.urlsplit(self.path).path.endswith('/'):
+                return None
+            for index in "index.html", "index.htm":
+                index = os.path.join(path, index)
+                try:
+                    st = os.stat(index)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    return index, st
+            return None
+        if path.endswith("/") or not stat.S_ISREG(st.st_mode):
+            return None
+        return path, st
+
+    def _not_modified(self, etag, mtime):
+        """Evaluate If-None-Match, then If-Modified-Since (RFC 9110 13.2.2)."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            tags = (tag.strip() for tag in if_none_match.split(","))
+            return any(tag.removeprefix("W/") == etag for tag in tags)
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is None:
+            return False
+        try:
+            ims = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if ims.tzinfo is None:
+            ims = ims.replace(tzinfo=datetime.timezone.utc)
+        last_modified = datetime.datetime.fromtimestamp(mtime, datetime.timezone.utc)
+        return last_modified.replace(microsecond=0) <= ims
+
+
+class SiteServer(socketserver.TCPServer):
+    """Single-threaded server: handles one connection at a time."""
+
+    allow_reuse_address = True
+    request_queue_size = 128
+    file_cache = None
+    access_log = None
+    metrics = None
+    livereload = None
+    keep_alive = False
+    idle_timeout = DEFAULT_IDLE_TIMEOUT
+    max_requests = DEFAULT_MAX_REQUESTS
+
+    def __init__(self, server_address, handler_class, directory, workers=DEFAULT_WORKERS):
+        self.directory = directory
+        super().__init__(server_address, handler_class)
+
+
+class ThreadingSiteServer(socketserver.ThreadingMixIn, SiteServer):
+    """Spawns a daemon thread per connection, like http.server.ThreadingHTTPServer."""
+
+    daemon_threads = True
+
+
+class PoolSiteServer(SiteServer):
+    """Hands accepted connections to a bounded thread pool."""
+
+    def __init__(self, server_address, handler_class, directory, workers=DEFAULT_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='serve')
+        super().__init__(server_address, handler_class, directory)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _BufferedRequestMixin:
+    """Runs a request handler over an already-read request head.
+
+    The asyncio server reads and writes the socket itself; the handler only
+    sees the request bytes and writes its response into an in-memory buffer.
+    """
+
+    def setup(self):
+        head, self.requests_handled = self.request
+        self.connection = None
+        self.rfile = io.BytesIO(head)
+        self.wfile = io.BytesIO()
+        self.deferred_body = None
+
+    def handle(self):
+        self.handle_one_request()
+
+    def finish(self):
+        pass
+
+    def copyfile(self, source, outputfile):
+        # Files on disk are handed back to the event loop, which sendfile()s
+        # them after the headers; the caller closes source, so keep a dup.
+        if self._body_range is not None and isinstance(source, io.BufferedReader):
+            offset, count = self._body_range
+            self._body_range = None
+            self.deferred_body = (os.fdopen(os.dup(source.fileno()), 'rb'), offset, count)
+            return
+        super().copyfile(source, outputfile)
+
+
+class AsyncioSiteServer:
+    """Accepts and parses connections on an asyncio event loop.
+
+    Slow or idle clients only cost a coroutine; building each response (stat,
+    open, read) runs on a bounded thread pool so it never blocks the loop.
+    Bodies of files on disk are sent with loop.sendfile().
+    Exposes the same serve_forever()/shutdown()/server_close() interface as
+    the socketserver based servers.
+    """
+
+    file_cache = None
+    access_log = None
+    metrics = None
+    livereload = None
+    keep_alive = False
+    idle_timeout = DEFAULT_IDLE_TIMEOUT
+    max_requests = DEFAULT_MAX_REQUESTS
+
+    def __init__(self, server_address, handler_class, directory, workers=DEFAULT_WORKERS):
+        self.directory = directory
+        self.RequestHandlerClass = type(
+            f'Buffered{handler_class.__name__}', (_BufferedRequestMixin, handler_class), {}
+        )
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='serve')
+        host, port = server_address
+        self.socket = socket.create_server((host, port), backlog=128)
+        self.server_address = self.socket.getsockname()[:2]
+        self._loop = None
+        self._stopped = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.server_close()
+
+    def serve_forever(self):
+        asyncio.run(self._serve())
+
+    def shutdown(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    def server_close(self):
+        self.socket.close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        server = await asyncio.start_server(self._handle_connection, sock=self.socket)
+        async with server:
+            await self._stopped.wait()
+
+    async def _handle_connection(self, reader, writer):
+        client_address = writer.get_extra_info('peername')[:2]
+        idle_timeout = self.idle_timeout if self.keep_alive else None
+        served = 0
+        if self.metrics is not None:
+            self.metrics.connection_opened()
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), idle_timeout)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        asyncio.TimeoutError, ConnectionError):
+                    break
+                response, body, keep_open = await self._loop.run_in_executor(
+                    self.executor, self._respond, (head, served), client_address
+                )
+                served += 1
+                writer.write(response)
+                if body is not None:
+                    file, offset, count = body
+                    with file:
+                        await self._loop.sendfile(writer.transport, file, offset, count)
+                await writer.drain()
+                if not keep_open:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            if self.metrics is not None:
+                self.metrics.connection_closed()
+
+    def _respond(self, request, client_address):
+        handler = self.RequestHandlerClass(request, client_address, self)
+        return handler.wfile.getvalue(), handler.deferred_body, not handler.close_connection
+
+
+SERVER_CLASSES = {
+    'single': SiteServer,
+    'threaded': ThreadingSiteServer,
+    'pool': PoolSiteServer,
+    'asyncio': AsyncioSiteServer,
+}
+
+
+def create_server(mode, server_address, directory, workers=DEFAULT_WORKERS, file_cache=None,
+                  keep_alive=False, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_requests=DEFAULT_MAX_REQUESTS,
+                  access_log=None, metrics=False, livereload=None):
+    """Build the server for a concurrency mode; it is bound but not yet serving."""
+    server = SERVER_CLASSES[mode](server_address, Handler, directory, workers=workers)
+    server.file_cache = file_cache
+    server.access_log = access_log
+    server.metrics = ServerMetrics(file_cache) if metrics else None
+    server.livereload = livereload
+    server.keep_alive = keep_alive
+    server.idle_timeout = idle_timeout
+    server.max_requests = max_requests
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the portfolio site locally')
+    parser.add_argument('--mode', choices=MODES, default=os.environ.get('SERVE_MODE', 'threaded'),
+                        help='Concurrency mode (default: threaded)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Threads for the pool and asyncio modes (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8000)),
+                        help='Port to listen on, 0 for any free port (default: $PORT or 8000)')
+    parser.add_argument('--access-log', default='-',
+                        help='Access log file, - for stderr, or off (default: -)')
+    parser.add_argument('--access-log-format', choices=ACCESS_LOG_FORMATS, default='common',
+                        help='common or json (default: common)')
+    parser.add_argument('--access-log-sample', type=float, default=1.0,
+                        help='Fraction of successful requests to log (default: 1)')
+    parser.add_argument('--no-metrics', action='store_true',
+                        help=f'Do not collect metrics or serve {METRICS_PATH}')
+    parser.add_argument('--watch', action='store_true',
+                        help=f'Rebuild on changes and reload open tabs ({"/".join(WATCH_MODES)} modes)')
+    parser.add_argument('--poll', action='store_true',
+                        help='With --watch, poll file stats instead of using inotify')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help=f'With --watch, seconds of quiet before rebuilding (default: {DEFAULT_DEBOUNCE:g})')
+    parser.add_argument('--ready-fd', type=int,
+                        help='Write the bound port to this inherited fd once listening')
+    parser.add_argument('--cache-mb', type=float, default=DEFAULT_CACHE_MB,
+                        help=f'File cache size in MB, 0 to disable (default: {DEFAULT_CACHE_MB})')
+    parser.add_argument('--cache-max-entry-kb', type=float, default=DEFAULT_CACHE_MAX_ENTRY_KB,
+                        help=f'Largest file kept in the cache, in KB (default: {DEFAULT_CACHE_MAX_ENTRY_KB})')
+    parser.add_argument('--keep-alive', action='store_true',
+                        help='Use HTTP/1.1 persistent connections')
+    parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help=f'Idle keep-alive timeout in seconds (default: {DEFAULT_IDLE_TIMEOUT:g})')
+    parser.add_argument('--max-requests', type=int, default=DEFAULT_MAX_REQUESTS,
+                        help=f'Requests per keep-alive connection (default: {DEFAULT_MAX_REQUESTS})')
+    args = parser.parse_args(argv)
+    if args.watch and args.mode not in WATCH_MODES:
+        parser.error(f'--watch needs --mode {" or ".join(WATCH_MODES)}')
+    return args
+
+
+def signal_ready(fd, port):
+    """Tell whoever started us which port we are listening on."""
+    try:
+        os.write(fd, f'{port}\n'.encode('ascii'))
+    except OSError:
+        pass  # the reader went away; serving is still fine
+    finally:
+        os.close(fd)
+
 
 def main():
+    args = parse_args()
+    access_log = open_access_log(
+        args.access_log if args.access_log in ('-', 'off') else os.path.abspath(args.access_log),
+        args.access_log_format, args.access_log_sample)
+    # Exit through the finally below on SIGTERM too, so queued log lines are written
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
     # Change to the project root directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
     os.chdir(project_root)
-    
-    PORT = int(os.environ.get('PORT', 8000))
-    
-    class Handler(http.server.SimpleHTTPRequestHandler):
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, directory=project_root, **kwargs)
-    
-    print(f"Starting development server at http://localhost:{PORT}")
-    print(f"Serving files from: {project_root}")
-    print("Press Ctrl+C to stop the server")
-    
+
+    PORT = args.port
+
+    file_cache = None
+    if args.cache_mb > 0:
+        file_cache = FileCache(int(args.cache_mb * 1024 * 1024), int(args.cache_max_entry_kb * 1024))
+
+    livereload = LiveReload() if args.watch else None
+    stop_watching = threading.Event()
+
     try:
-        with socketserver.TCPServer(("", PORT), Handler) as httpd:
+        with create_server(args.mode, ("", PORT), project_root, args.workers, file_cache,
+                           args.keep_alive, args.idle_timeout, args.max_requests, access_log,
+                           not args.no_metrics, livereload) as httpd:
+            # The socket is listening from here on; connections queue until serve_forever
+            PORT = httpd.server_address[1]
+            print(f"Starting development server at http://localhost:{PORT}")
+            print(f"Serving files from: {project_root}")
+            print(f"Concurrency mode: {args.mode}")
+            if not args.no_metrics:
+                print(f"Metrics: http://localhost:{PORT}{METRICS_PATH}")
+            if args.keep_alive:
+                print(f"HTTP/1.1 keep-alive: {args.idle_timeout:g}s idle timeout, {args.max_requests} requests per connection")
+            if livereload is not None:
+                print(f"Live reload: rebuilding on changes, tabs listen on {LIVERELOAD_PATH}")
+                threading.Thread(target=watch, name='watch', daemon=True,
+                                 args=(project_root, livereload.notify, args.debounce, args.poll),
+                                 kwargs={'stop': stop_watching}).start()
+            print("Press Ctrl+C to stop the server", flush=True)
+            if args.ready_fd is not None:
+                signal_ready(args.ready_fd, PORT)
             httpd.serve_forever()
     except KeyboardInterrupt:
         print("\nServer stopped.")
         sys.exit(0)
     except OSError as e:
-        if e.errno == 48:  # Address already in use
+        if e.errno == errno.EADDRINUSE:
             print(f"Error: Port {PORT} is already in use. Please stop any other servers running on this port.")
             sys.exit(1)
         else:
             raise
+    finally:
+        stop_watching.set()
+        if livereload is not None:
+            livereload.close()
+        if access_log is not None:
+            access_log.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,41 @@
+"""
+Shared loader for assets/data/site.config.json.
+Every build step that reads the config (create_resume.py, bundle_config.py,
+prerender.py) goes through load_site_config(), so they all see the same
+validated data and fail the same way on a bad config.
+"""
+
+import os
+import json
+
+from validate_config import validate
+
+CONFIG_PATH = os.path.join('assets', 'data', 'site.config.json')
+
+
+class ConfigError(Exception):
+    """The config is missing, not JSON, or does not match the schema."""
+
+    def __init__(self, errors):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+
+
+def default_project_root():
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_site_config(project_root=None):
+    """Read and validate the site config; raises ConfigError listing every problem."""
+    path = os.path.join(project_root or default_project_root(), CONFIG_PATH)
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    except OSError as e:
+        raise ConfigError([f'{CONFIG_PATH}: {e.strerror}']) from e
+    except ValueError as e:
+        raise ConfigError([f'{CONFIG_PATH}: invalid JSON: {e}']) from e
+    errors = validate(config)
+    if errors:
+        raise ConfigError(errors)
+    return config
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Schema validation for assets/data/site.config.json.
+The schema below is compiled once into nested check functions; validating
+walks the config a single time and reports every problem with its JSON path
+(e.g. $.projects[3].stack), instead of stopping at the first one.
+
+Usage:
+    python3 _scripts/validate_config.py [config.json] [--bench N]
+
+Options:
+    --bench N    Time validation of a synthetic config with N projects,
+                 experience entries and keywords instead of checking a file
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+URL_PATTERN = re.compile(r'https?://\S+$')
+IDENTIFIER = re.compile(r'[A-Za-z_$][A-Za-z0-9_$]*$')
+
+
+class Optional:
+    """Marks a dict key that may be absent."""
+
+    def __init__(self, schema):
+        self.schema = schema
+
+
+class MapOf:
+    """An object with arbitrary keys whose values all match one schema."""
+
+    def __init__(self, schema):
+        self.schema = schema
+
+
+class Pattern:
+    """A string matching a regular expression; allow_empty also accepts ''."""
+
+    def __init__(self, regex, description, allow_empty=False):
+        self.regex = regex
+        self.description = description
+        self.allow_empty = allow_empty
+
+
+TEXT = str
+URL = Pattern(URL_PATTERN, 'an http(s) URL')
+OPTIONAL_URL = Pattern(URL_PATTERN, 'an http(s) URL or ""', allow_empty=True)
+
+# Dicts are objects with those keys (extra keys are allowed), one-element
+# lists are arrays of that item, str is a non-empty string
+SCHEMA = {
+    'name': TEXT,
+    'role': TEXT,
+    'summary': TEXT,
+    'keywords': [TEXT],
+    'keywordLinks': MapOf(URL),
+    'links': {
+        'linkedin': URL,
+        'github': URL,
+    },
+    'projects': [{
+        'title': TEXT,
+        'description': TEXT,
+        'stack': [TEXT],
+        'links': {
+            'repo': URL,
+            Optional('demo'): OPTIONAL_URL,
+        },
+    }],
+    'experience': [{
+        'company': TEXT,
+        'title': TEXT,
+        'period': TEXT,
+        'highlights': [TEXT],
+    }],
+    'meta': {
+        'title': TEXT,
+        'description': TEXT,
+    },
+    Optional('certifications'): [{
+        'name': TEXT,
+        'issuer': TEXT,
+        'date': TEXT,
+    }],
+}
+
+TYPE_NAMES = {dict: 'object', list: 'array', str: 'string', bool: 'boolean',
+              int: 'number', float: 'number', type(None): 'null'}
+
+
+def format_path(path):
+    parts = ['$']
+    for part in path:
+        if isinstance(part, int):
+            parts.append(f'[{part}]')
+        elif IDENTIFIER.match(part):
+            parts.append(f'.{part}')
+        else:
+            parts.append(f'[{json.dumps(part)}]')
+    return ''.join(parts)
+
+
+def _error(errors, path, message):
+    errors.append(f'{format_path(path)}: {message}')
+
+
+def _type_error(errors, path, expected, value):
+    _error(errors, path, f'expected {expected}, got {TYPE_NAMES.get(type(value), type(value).__name__)}')
+
+
+def compile_schema(schema):
+    """Turn a schema into check(value, errors, path).
+
+    path is a list used as a stack, so descending costs an append/pop and
+    paths are only formatted for values that fail.
+    """
+    if schema is str:
+        def check_text(value, errors, path):
+            if type(value) is not str:
+                _type_error(errors, path, 'string', value)
+            elif not value.strip():
+                _error(errors, path, 'must not be empty')
+        return check_text
+
+    if isinstance(schema, Pattern):
+        match = schema.regex.match
+
+        def check_pattern(value, errors, path):
+            if type(value) is not str:
+                _type_error(errors, path, 'string', value)
+            elif not (schema.allow_empty and value == '') and not match(value):
+                _error(errors, path, f'expected {schema.description}, got {value!r}')
+        return check_pattern
+
+    if isinstance(schema, list):
+        check_item = compile_schema(schema[0])
+
+        def check_array(value, errors, path):
+            if type(value) is not list:
+                _type_error(errors, path, 'array', value)
+                return
+            for i, item in enumerate(value):
+                path.append(i)
+                check_item(item, errors, path)
+                path.pop()
+        return check_array
+
+    if isinstance(schema, MapOf):
+        check_value = compile_schema(schema.schema)
+
+        def check_map(value, errors, path):
+            if type(value) is not dict:
+                _type_error(errors, path, 'object', value)
+                return
+            for key, item in value.items():
+                path.append(key)
+                check_value(item, errors, path)
+                path.pop()
+        return check_map
+
+    if isinstance(schema, dict):
+        fields = []
+        for key, field_schema in schema.items():
+            required = not isinstance(key, Optional)
+            fields.append((key if required else key.schema, required, compile_schema(field_schema)))
+        fields = tuple(fields)
+
+        def check_object(value, errors, path):
+            if type(value) is not dict:
+                _type_error(errors, path, 'object', value)
+                return
+            for key, required, check_field in fields:
+                if key in value:
+                    path.append(key)
+                    check_field(value[key], errors, path)
+                    path.pop()
+                elif required:
+                    _error(errors, path, f'missing required key "{key}"')
+        return check_object
+
+    raise TypeError(f'unsupported schema node: {schema!r}')
+
+
+_check_config = compile_schema(SCHEMA)
+
+
+def validate(config):
+    """Return every schema error in the config as 'path: message' strings."""
+    errors = []
+    _check_config(config, errors, [])
+    return errors
+
+
+def validate_file(path):
+    """Parse and validate a config file; JSON syntax errors are reported too."""
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    except OSError as e:
+        return [f'{path}: {e.strerror}']
+    except ValueError as e:
+        return [f'{path}: invalid JSON: {e}']
+    return validate(config)
+
+
+def synthetic_config(entries):
+    """A valid config with the given number of projects, experience entries and keywords."""
+    return {
+        'name': 'Benchmark', 'role': 'SDET', 'summary': 'Synthetic config for benchmarking.',
+        'keywords': [f'Keyword {i}' for i in range(entries)],
+        'keywordLinks': {f'Keyword {i}': f'https://example.com/{i}' for i in range(entries)},
+        'links': {'linkedin': 'https://www.linkedin.com/in/example/', 'github': 'https://github.com/example'},
+        'projects': [{'title': f'Project {i}', 'description': 'Description.', 'stack': ['Python', 'AWS', 'Docker'],
+                      'links': {'repo': f'https://github.com/example/{i}', 'demo': ''}} for i in range(entries)],
+        'experience': [{'company': f'Company {i}', 'title': 'Engineer', 'period': '2020 — 2024',
+                        'highlights': ['Shipped things', 'Tested things']} for i in range(entries)],
+        'meta': {'title': 'Benchmark', 'description': 'Benchmark config.'},
+        'certifications': [{'name': f'Cert {i}', 'issuer': 'Issuer', 'date': '2024'} for i in range(entries)],
+    }
+
+
+def benchmark(entries, rounds=20):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        compile_schema(SCHEMA)
+    compile_ms = (time.perf_counter() - started) / rounds * 1000
+
+    config = synthetic_config(entries)
+    valid_ms = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        errors = validate(config)
+        valid_ms.append((time.perf_counter() - started) * 1000)
+    assert not errors, errors[:5]
+
+    # Break every other project so error reporting is part of the measurement
+    for project in config['projects'][::2]:
+        del project['stack']
+    started = time.perf_counter()
+    errors = validate(config)
+    invalid_ms = (time.perf_counter() - started) * 1000
+
+    print(f"ℹ️  Schema compile: {compile_ms:.3f} ms")
+    print(f"ℹ️  Valid config, {entries} entries per list: best {min(valid_ms):.2f} ms of {rounds}")
+    print(f"ℹ️  Config with {len(errors)} errors: {invalid_ms:.2f} ms")
+
+
+def main():
+    project_root = Path(__file__).resolve().parent.parent
+    parser = argparse.ArgumentParser(description='Validate site.config.json against its schema')
+    parser.add_argument('config', nargs='?', default=project_root / 'assets' / 'data' / 'site.config.json',
+                        help='Config file to check (default: assets/data/site.config.json)')
+    parser.add_argument('--bench', type=int, metavar='N', help='Benchmark with N entries per list')
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.bench)
+        return 0
+
+    errors = validate_file(args.config)
+    if errors:
+        print(f"❌ {args.config}: {len(errors)} error(s)")
+        for error in errors:
+            print(f"  • {error}")
+        return 1
+    print(f"✅ {args.config} is valid")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
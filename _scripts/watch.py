@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Rebuild the site as files change.
+Watches the project with inotify (through ctypes, no packages needed) or, where
+inotify is not available, by polling file stats. Bursts of events (an editor's
+save is often several) are debounced into one change set, and only the build
+steps that the changed files affect are rerun:
+
+    assets/data/site.config.json   validate, bundles, prerender, compress, resumes
+    assets/images/*                image derivatives, prerender
+    other text assets              compress (.gz/.br siblings)
+
+Resumes are regenerated after the page-facing steps, since nothing on the page
+waits for them. serve.py --watch runs the same loop and then tells open tabs to
+reload over Server-Sent Events (/__livereload).
+
+Usage:
+    python3 _scripts/watch.py [--poll] [--debounce 0.1]
+
+Options:
+    --poll       Poll file stats instead of using inotify
+    --interval   Seconds between polls (default: 0.5)
+    --debounce   Seconds without events before a change set is built (default: 0.1)
+"""
+
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import fnmatch
+import select
+import struct
+import argparse
+import subprocess
+
+CONFIG_PATH = 'assets/data/site.config.json'
+DEFAULT_DEBOUNCE = 0.1
+DEFAULT_POLL_INTERVAL = 0.5
+# Never looked at: tooling, test output and files the build steps write themselves
+IGNORED_DIRS = {'.git', '.github', '.idea', 'node_modules', '_scripts', 'test', 'test-reports',
+                'test-results', 'playwright-report', '.lighthouseci', '.gate-cache', '__pycache__'}
+IGNORED_PATTERNS = ('.*', '*.gz', '*.br', '*.tmp', '*~', '*.swp', 'assets/images/derived/*')
+TEXT_ASSETS = ('*.html', '*.css', '*.js', '*.json', '*.xml', '*.svg', '*.txt', '*.webmanifest')
+
+
+class Step:
+    """A build step: the files that trigger it and the files it writes.
+
+    Events for a step's outputs that arrive while it runs are its own doing
+    and do not start another round.
+    """
+
+    def __init__(self, name, args, triggers, outputs=(), after_reload=False):
+        self.name = name
+        self.args = args
+        self.triggers = triggers
+        self.outputs = outputs
+        self.after_reload = after_reload
+
+
+# In the order they run; later steps read what earlier ones wrote
+STEPS = [
+    Step('validate', ['validate_config.py', CONFIG_PATH], [CONFIG_PATH]),
+    Step('bundles', ['bundle_config.py'], [CONFIG_PATH],
+         outputs=['assets/data/site.config.*.json', 'index.html', 'js/sw.js']),
+    Step('images', ['build_images.py'], ['assets/images/*'], outputs=['assets/images/derived/*']),
+    Step('prerender', ['prerender.py'], [CONFIG_PATH, 'assets/images/*'], outputs=['index.html']),
+    Step('compress', ['compress_assets.py'], TEXT_ASSETS),
+    Step('resumes', ['create_resume.py'], [CONFIG_PATH],
+         outputs=['assets/andrew-nixdorf-resume.*'], after_reload=True),
+]
+
+
+def matches(path, patterns):
+    return any(fnmatch.fnmatch(path, pattern) for pattern in patterns)
+
+
+def is_ignored_dir(name):
+    return name in IGNORED_DIRS or name.startswith('.')
+
+
+def is_ignored(path):
+    parts = path.split('/')
+    if any(is_ignored_dir(part) for part in parts[:-1]):
+        return True
+    return matches(parts[-1], IGNORED_PATTERNS) or matches(path, IGNORED_PATTERNS)
+
+
+def plan(paths):
+    """The steps to run for a set of changed paths, None meaning unknown (run all)."""
+    if paths is None:
+        return list(STEPS)
+    return [step for step in STEPS if any(matches(path, step.triggers) for path in paths)]
+
+
+class InotifyWatcher:
+    """Recursive inotify watch of a directory tree, through libc via ctypes."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, root):
+        self.root = root
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs = {}
+        self._add_tree(root)
+
+    def _add_tree(self, directory):
+        """Watch directory and everything below it; returns the files already in it."""
+        found = set()
+        for current, dirnames, filenames in os.walk(directory):
+            relative = os.path.relpath(current, self.root)
+            relative = '' if relative == '.' else relative + '/'
+            dirnames[:] = [d for d in dirnames if not is_ignored_dir(d)]
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(current), self.MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if current == directory and directory == self.root:
+                    raise OSError(errno, f'inotify_add_watch failed for {current}')
+                continue  # vanished, or over max_user_watches
+            self.dirs[wd] = relative
+            found.update(relative + name for name in filenames)
+        return found
+
+    def read(self, timeout):
+        """Relative paths changed within timeout seconds; None if events were lost."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, length = self.EVENT.unpack_from(buffer, offset)
+            name = buffer[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b'\0')
+            offset += self.EVENT.size + length
+            if mask & self.IN_Q_OVERFLOW:
+                return None
+            if mask & self.IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            if wd not in self.dirs:
+                continue
+            path = self.dirs[wd] + os.fsdecode(name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and not is_ignored(path + '/'):
+                    # Files can land in a new directory before its watch exists
+                    changed.update(self._add_tree(os.path.join(self.root, path)))
+                continue
+            if mask & self.IN_CREATE:
+                continue  # the IN_CLOSE_WRITE that follows carries the content
+            changed.add(path)
+        return {path for path in changed if not is_ignored(path)}
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Compares (mtime, size) of every file against the previous scan."""
+
+    def __init__(self, root, interval=DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for current, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not is_ignored_dir(d)]
+            relative = os.path.relpath(current, self.root)
+            relative = '' if relative == '.' else relative + '/'
+            for name in filenames:
+                path = relative + name
+                if is_ignored(path):
+                    continue
+                try:
+                    st = os.stat(os.path.join(current, name))
+                except OSError:
+                    continue
+                snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def read(self, timeout):
+        time.sleep(min(timeout, self.interval) if timeout is not None else self.interval)
+        snapshot = self._scan()
+        changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                   if snapshot.get(path) != self.snapshot.get(path)}
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(root, poll=False, interval=DEFAULT_POLL_INTERVAL):
+    """inotify where the platform has it, polling otherwise (or when asked)."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️  inotify unavailable ({e}); polling every {interval:g}s")
+    return PollingWatcher(root, interval)
+
+
+def run_step(step, project_root):
+    """Run one step's script; prints its outcome and returns whether it passed."""
+    script_dir = os.path.join(project_root, '_scripts')
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(script_dir, step.args[0]), *step.args[1:]],
+                            cwd=project_root, capture_output=True, text=True)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if result.returncode == 0:
+        print(f"  ✅ {step.name} ({elapsed_ms:.0f} ms)", flush=True)
+        return True
+    print(f"  ❌ {step.name} failed ({elapsed_ms:.0f} ms)", flush=True)
+    output = (result.stdout + result.stderr).strip()
+    if output:
+        print('\n'.join(f"     {line}" for line in output.splitlines()[-20:]), flush=True)
+    return False
+
+
+def rebuild(paths, project_root, on_rebuilt=None):
+    """Run the steps for a change set; returns the steps that ran.
+
+    on_rebuilt(paths) is called once the page-facing steps succeeded (before
+    the after_reload ones). A failed step stops the round.
+    """
+    steps = plan(paths)
+    label = 'files changed (events lost)' if paths is None else ', '.join(sorted(paths)[:5])
+    if paths is not None and len(paths) > 5:
+        label += f' and {len(paths) - 5} more'
+    print(f"🔄 {label}", flush=True)
+
+    ran = []
+    notified = False
+    for step in steps:
+        if step.after_reload and not notified:
+            notified = True
+            if on_rebuilt is not None:
+                on_rebuilt(sorted(paths or []))
+        ran.append(step)
+        if not run_step(step, project_root):
+            return ran
+    if not notified and on_rebuilt is not None:
+        on_rebuilt(sorted(paths or []))
+    return ran
+
+
+def watch(project_root, on_rebuilt=None, debounce=DEFAULT_DEBOUNCE, poll=False,
+          interval=DEFAULT_POLL_INTERVAL, stop=None):
+    """Watch project_root until stop (a threading.Event) is set or Ctrl+C."""
+    watcher = open_watcher(project_root, poll, interval)
+    kind = 'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'
+    print(f"👀 Watching {project_root} ({kind}, {debounce * 1000:.0f} ms debounce)", flush=True)
+    pending = set()  # None when events were lost: rebuild everything
+    try:
+        while stop is None or not stop.is_set():
+            # Idle: wake up now and then to check stop; busy: wait for a quiet period
+            changed = watcher.read(debounce if pending is None or pending else 1.0)
+            if changed is None:
+                pending = None
+                continue
+            if changed:
+                if pending is not None:
+                    pending |= changed
+                continue
+            if pending is not None and not pending:
+                continue
+
+            ran = rebuild(pending, project_root, on_rebuilt)
+            # Drop the events our own steps caused while they ran
+            own = [pattern for step in ran for pattern in step.outputs]
+            leftover = watcher.read(0)
+            pending = None if leftover is None else {path for path in leftover if not matches(path, own)}
+    finally:
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild the site as files change')
+    parser.add_argument('--poll', action='store_true', help='Poll file stats instead of using inotify')
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help=f'Seconds between polls (default: {DEFAULT_POLL_INTERVAL:g})')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help=f'Quiet period before building, in seconds (default: {DEFAULT_DEBOUNCE:g})')
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+    try:
+        watch(project_root, debounce=args.debounce, poll=args.poll, interval=args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
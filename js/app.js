@@ -1,7 +1,19 @@
 
+// The preload in index.html names the fingerprinted critical bundle written by
+// _scripts/bundle_config.py; without it, fall back to the full config.
 async function loadConfig(){
-  const res = await fetch('./assets/data/site.config.json');
+  const bundle = document.querySelector('link[data-bundle="critical"]');
+  const res = await fetch(bundle ? bundle.href : './assets/data/site.config.json');
   const cfg = await res.json();
+  renderHero(cfg);
+  // index.html prerendered by _scripts/prerender.py already has the tags, projects and experience
+  if (document.querySelector('#projects .card')) return;
+  const rest = cfg.restBundle ? await (await fetch(new URL(cfg.restBundle, res.url))).json() : cfg;
+  renderTags(cfg.keywords, rest.keywordLinks);
+  renderRest(rest);
+}
+
+function renderHero(cfg){
   // Hero
   document.querySelector('#name').textContent = cfg.name;
   document.querySelector('#role').textContent = cfg.role;
@@ -30,16 +42,34 @@ async function loadConfig(){
     a.textContent = label;
     heroLinks.appendChild(a);
   });
+  // Contact
+  const contact = document.querySelector('#contact-links'); contact.innerHTML = '';
+  Object.entries(cfg.links).forEach(([k,v]) => {
+    if (!v) return;
+    const nice = k[0].toUpperCase()+k.slice(1);
+    contact.innerHTML += `<a href="${v}" target="_blank" rel="noopener noreferrer">${nice}</a> · `;
+  });
+
+  // Meta
+  document.title = cfg.meta.title;
+  const desc = document.querySelector('meta[name="description"]');
+  if (desc) desc.setAttribute('content', cfg.meta.description);
+}
+
+function renderTags(keywords, keywordLinks){
   const tags = document.querySelector('#tags'); tags.innerHTML = '';
-  cfg.keywords.forEach(k => {
+  keywords.forEach(k => {
     const link = document.createElement('a');
-    link.href = cfg.keywordLinks[k] || '#';
+    link.href = keywordLinks[k] || '#';
     link.target = '_blank';
     link.rel = 'noopener noreferrer';
     link.className = 'tag';
     link.textContent = k;
     tags.appendChild(link);
   });
+}
+
+function renderRest(cfg){
   // Projects
   const list = document.querySelector('#projects'); list.innerHTML = '';
   cfg.projects.forEach(p => {
@@ -68,19 +98,6 @@ async function loadConfig(){
     el.innerHTML = `<h3>${e.company} — ${e.title}</h3><p class="period">${e.period}</p>${highlightsList}`;
     exp.appendChild(el);
   });
-
-  // Contact
-  const contact = document.querySelector('#contact-links'); contact.innerHTML = '';
-  Object.entries(cfg.links).forEach(([k,v]) => {
-    if (!v) return;
-    const nice = k[0].toUpperCase()+k.slice(1);
-    contact.innerHTML += `<a href="${v}" target="_blank" rel="noopener noreferrer">${nice}</a> · `;
-  });
-
-  // Meta
-  document.title = cfg.meta.title;
-  const desc = document.querySelector('meta[name="description"]');
-  if (desc) desc.setAttribute('content', cfg.meta.description);
 }
 loadConfig();
 if ('serviceWorker' in navigator) { window.addEventListener('load', () => navigator.serviceWorker.register('./js/sw.js')); }
@@ -1,6 +1,6 @@
 
-const CACHE = "andrewnixdorf-website";
-const ASSETS = ["../","../index.html","../css/style.css","./app.js","../assets/data/site.config.json","../assets/images/devreno.jpg","../assets/images/reno-gear.jpg"];
+const CACHE = "andrewnixdorf-website-89dc5e2c3c";
+const ASSETS = ["../","../index.html","../css/style.css","./app.js","../assets/data/site.config.critical.89dc5e2c3c.json","../assets/data/site.config.rest.04c2d796e6.json","../assets/images/devreno.jpg","../assets/images/reno-gear.jpg"];
 
 self.addEventListener("install",(e)=>{
   e.waitUntil(
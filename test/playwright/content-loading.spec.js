@@ -9,21 +9,27 @@ test.describe('Core Content Loading & Rendering', () => {
     await homePage.goto();
   });
 
-  test('should load site.config.json successfully', async ({ page }) => {
+  test('should load the fingerprinted site.config bundles successfully', async ({ page }) => {
     // Navigate to page with network monitoring
-    const responsePromise = page.waitForResponse(response =>
-      response.url().includes('site.config.json') && response.status() === 200
+    const criticalPromise = page.waitForResponse(response =>
+      /site\.config\.critical\.[0-9a-f]+\.json$/.test(response.url()) && response.status() === 200
     );
 
     await page.goto('/');
-    const configResponse = await responsePromise;
+    const criticalResponse = await criticalPromise;
 
-    expect(configResponse.status()).toBe(200);
-    expect(configResponse.url()).toContain('site.config.json');
+    expect(criticalResponse.status()).toBe(200);
 
-    // Verify we can parse the JSON
-    const json = await configResponse.json();
-    expect(json.name).toBe('Andrew Nixdorf');
+    // The critical bundle carries the hero fields and names the rest bundle
+    const critical = await criticalResponse.json();
+    expect(critical.name).toBe('Andrew Nixdorf');
+    expect(critical.restBundle).toMatch(/^site\.config\.rest\.[0-9a-f]+\.json$/);
+
+    // The prerendered page does not need the rest bundle, but it must still be served
+    const restResponse = await page.request.get(new URL(critical.restBundle, criticalResponse.url()).href);
+    expect(restResponse.status()).toBe(200);
+    const rest = await restResponse.json();
+    expect(rest.projects.length).toBeGreaterThan(0);
   });
 
   test('should render name from config', async () => {
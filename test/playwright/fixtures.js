@@ -12,7 +12,7 @@ async function waitForEasterEggScript(page) {
 }
 
 /**
- * Helper function to wait for content to load from site.config.json
+ * Helper function to wait for content to load from the site.config bundles
  * @param {import('@playwright/test').Page} page
  */
 async function waitForContentLoad(page) {
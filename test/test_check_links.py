@@ -0,0 +1,108 @@
+"""
+Tests for _scripts/check_links.py against a local stub server.
+
+Run with: python3 -m pytest test/test_check_links.py (or python3 -m unittest)
+"""
+
+import os
+import sys
+import asyncio
+import threading
+import unittest
+import http.server
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '_scripts'))
+
+from check_links import DEFAULTS, LinkChecker, is_excluded
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """Refuses HEAD everywhere, like many CDNs; /flaky fails once before it works."""
+
+    attempts = {}
+
+    def do_HEAD(self):
+        self.send_error(405)
+
+    def do_GET(self):
+        count = self.attempts[self.path] = self.attempts.get(self.path, 0) + 1
+        if self.path == '/flaky' and count == 1:
+            self.send_error(503)
+        elif self.path == '/huge-headers':
+            # More header bytes than a StreamReader buffers (64 KiB)
+            self.send_response(200)
+            self.send_header('X-Padding', 'x' * 80 * 1024)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.path == '/moved':
+            self.send_response(301)
+            self.send_header('Location', '/ok')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.path in ('/ok', '/flaky'):
+            body = b'ok'
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LinkCheckerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.base = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubHandler.attempts.clear()
+
+    def run_checker(self, method, url):
+        async def run():
+            checker = LinkChecker(dict(DEFAULTS, accept=[200], timeout=5, max_retries=2))
+            try:
+                return await getattr(checker, method)(url)
+            finally:
+                checker.close()
+        return asyncio.run(run())
+
+    def test_follow_falls_back_to_get_when_head_is_refused(self):
+        self.assertEqual(self.run_checker('follow', f'{self.base}/ok'), 200)
+        self.assertEqual(StubHandler.attempts, {'/ok': 1})
+
+    def test_follow_follows_redirects_with_get(self):
+        self.assertEqual(self.run_checker('follow', f'{self.base}/moved'), 200)
+
+    def test_follow_reports_missing_pages(self):
+        self.assertEqual(self.run_checker('follow', f'{self.base}/missing'), 404)
+
+    def test_check_retries_transient_errors(self):
+        result = self.run_checker('check', f'{self.base}/flaky')
+        self.assertTrue(result['ok'])
+        self.assertEqual(StubHandler.attempts['/flaky'], 2)
+
+    def test_check_reports_oversized_headers_as_a_failed_link(self):
+        result = self.run_checker('check', f'{self.base}/huge-headers')
+        self.assertFalse(result['ok'])
+        self.assertTrue(result['error'].startswith('LimitOverrunError'))
+
+    def test_exclude_entries_are_regular_expressions(self):
+        patterns = [r'^https?://([a-z]+\.)?linkedin\.com/', r'^mailto:']
+        self.assertTrue(is_excluded('https://www.linkedin.com/in/someone/', patterns))
+        self.assertTrue(is_excluded('mailto:someone@example.com', patterns))
+        self.assertFalse(is_excluded('https://linkedinxcom.example/', patterns))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Tests for _scripts/serve.py, run as a subprocess the way run_tests.py starts it.
+
+Run with: python3 -m pytest test/test_serve.py (or python3 -m unittest)
+"""
+
+import os
+import sys
+import time
+import select
+import signal
+import socket
+import struct
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVE = os.path.join(PROJECT_ROOT, '_scripts', 'serve.py')
+# Served from the project root; test-reports/ is ignored by git
+LARGE_DIR = os.path.join(PROJECT_ROOT, 'test-reports', 'serve-test')
+LARGE_SIZE = 8 * 1024 * 1024
+
+
+def start_server(mode, log):
+    """Start serve.py on a free port with a cache large enough for LARGE_SIZE bodies."""
+    ready_read, ready_write = os.pipe()
+    try:
+        process = subprocess.Popen(
+            [sys.executable, SERVE, '--mode', mode, '--port', '0', '--ready-fd', str(ready_write),
+             '--access-log', 'off', '--cache-mb', '64', '--cache-max-entry-kb', '16384'],
+            stdout=subprocess.DEVNULL, stderr=log, pass_fds=(ready_write,))
+    finally:
+        os.close(ready_write)
+    try:
+        readable, _, _ = select.select([ready_read], [], [], 10)
+        line = os.read(ready_read, 64).decode('ascii') if readable else ''
+    finally:
+        os.close(ready_read)
+    if not line.strip().isdigit():
+        process.kill()
+        process.wait()
+        raise RuntimeError('serve.py did not start')
+    return process, int(line)
+
+
+def request_large(port, extra_headers=''):
+    """Ask for the large file and read only the start of the response."""
+    sock = socket.create_connection(('127.0.0.1', port), timeout=5)
+    sock.sendall(f'GET /test-reports/serve-test/large.bin HTTP/1.1\r\nHost: localhost\r\n'
+                 f'{extra_headers}\r\n'.encode('ascii'))
+    sock.recv(4096)
+    return sock
+
+
+def reset(sock):
+    """Close with an RST, so the server's pending write fails."""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+    sock.close()
+
+
+class CachedBodyDisconnectTest(unittest.TestCase):
+    """Clients that go away in the middle of a cached body."""
+
+    @classmethod
+    def setUpClass(cls):
+        os.makedirs(LARGE_DIR, exist_ok=True)
+        with open(os.path.join(LARGE_DIR, 'large.bin'), 'wb') as f:
+            f.write(os.urandom(LARGE_SIZE))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(LARGE_DIR, ignore_errors=True)
+
+    def setUp(self):
+        self.log = tempfile.TemporaryFile()
+
+    def tearDown(self):
+        self.log.close()
+
+    def server_output(self):
+        self.log.seek(0)
+        return self.log.read().decode('utf-8', errors='replace')
+
+    def stop(self, process):
+        """SIGTERM the server; returns whether it exited within 5 seconds."""
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=5)
+            return True
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            return False
+
+    def test_disconnect_during_body_is_not_masked(self):
+        process, port = start_server('threaded', self.log)
+        try:
+            reset(request_large(port))  # fills the cache
+            for headers in ('', 'Range: bytes=1024-\r\n') * 3:
+                reset(request_large(port, headers))
+            time.sleep(0.5)
+            with socket.create_connection(('127.0.0.1', port), timeout=5) as sock:
+                sock.sendall(b'HEAD / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+                self.assertTrue(sock.recv(4096).startswith(b'HTTP/1.0 200'))
+        finally:
+            self.assertTrue(self.stop(process))
+        self.assertNotIn('BufferError', self.server_output())
+
+    def test_sigterm_during_body_write_stops_single_mode(self):
+        process, port = start_server('single', self.log)
+        try:
+            reset(request_large(port))  # fills the cache
+            # Never read the rest: the server blocks writing the cached body
+            sock = request_large(port)
+            time.sleep(0.5)
+            self.assertTrue(self.stop(process))
+            sock.close()
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        self.assertNotIn('BufferError', self.server_output())
+
+
+if __name__ == '__main__':
+    unittest.main()